@@ -1781,6 +1781,7 @@ class DockerComposeCLI:
         """Generate database initialization scripts"""
         self.logger.info(f"Generating database scripts for {args.template_type} project: {args.project_name}")
         
+        from datetime import datetime
         from src.core.database_manager import DatabaseManager, create_database_config
         
         try:
@@ -1809,7 +1810,8 @@ class DockerComposeCLI:
             
             created_files = {}
             
-            # Generate scripts for each target database
+            # Generate scripts for each target database, stamped with one timestamp
+            timestamp = datetime.now().isoformat()
             for db_type in target_dbs:
                 print(f"\n🔧 Generating {db_type.upper()} initialization script...")
                 
@@ -1825,7 +1827,7 @@ class DockerComposeCLI:
                 
                 try:
                     # Generate script
-                    script_content = manager.generate_database_init_script(config)
+                    script_content = manager.generate_database_init_script(config, timestamp)
                     
                     # Determine output file
                     if db_type == 'postgresql':
@@ -7,13 +7,30 @@ Creates distribution packages for the Multi-Student Docker Compose CLI Tool.
 import os
 import sys
 import shutil
-import subprocess
-import tempfile
-import zipfile
-import tarfile
+import hashlib
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import fnmatch
 import json
+import re
+
+
+def _compile_ignore(*patterns: str):
+    """Build a copytree ignore callable backed by one precompiled regex"""
+    regex = re.compile("|".join(fnmatch.translate(p) for p in patterns))
+    
+    def _ignore(directory, names):
+        return [name for name in names if regex.match(name)]
+    
+    return _ignore
+
+
+# Compiled once and shared by every copytree/walk
+_IGNORE_BUILD_ARTIFACTS = _compile_ignore('__pycache__', '*.pyc', '*.pyo', '.pytest_cache')
+_IGNORE_SENSITIVE = _compile_ignore('*.enc', '*.key', 'logs', 'backups')
+
 
 class DistributionBuilder:
     """Builds distribution packages"""
@@ -22,13 +39,15 @@ class DistributionBuilder:
         self.root_dir = Path(__file__).parent
         self.dist_dir = self.root_dir / "dist"
         self.build_dir = self.root_dir / "build"
+        self.cache_dir = self.root_dir / ".build-cache"
         self.version = self._get_version()
         
-        # Clean previous builds
-        if self.dist_dir.exists():
-            shutil.rmtree(self.dist_dir)
-        if self.build_dir.exists():
-            shutil.rmtree(self.build_dir)
+        # Clean previous builds (the two trees are independent, remove them concurrently)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            removals = [executor.submit(shutil.rmtree, old_dir)
+                        for old_dir in (self.dist_dir, self.build_dir) if old_dir.exists()]
+            for removal in removals:
+                removal.result()
         
         self.dist_dir.mkdir()
         self.build_dir.mkdir()
@@ -42,12 +61,13 @@ class DistributionBuilder:
     
     def build_source_distribution(self) -> Path:
         """Build source distribution"""
+        import tarfile
+        
         print("Building source distribution...")
         
         # Create source package directory
         package_name = f"multi-student-docker-compose-{self.version}"
         package_dir = self.build_dir / package_name
-        package_dir.mkdir()
         
         # Files to include in source distribution
         include_files = [
@@ -67,20 +87,7 @@ class DistributionBuilder:
             "admin-tools",
         ]
         
-        # Copy files
-        for file_name in include_files:
-            src_file = self.root_dir / file_name
-            if src_file.exists():
-                shutil.copy2(src_file, package_dir / file_name)
-        
-        # Copy directories
-        for dir_name in include_dirs:
-            src_dir = self.root_dir / dir_name
-            if src_dir.exists():
-                shutil.copytree(src_dir, package_dir / dir_name, 
-                              ignore=shutil.ignore_patterns('__pycache__', '*.pyc', '*.pyo', '.pytest_cache'))
-        
-        # Copy documentation files
+        # Documentation files to include
         doc_files = [
             "MULTI_STUDENT_DOCKER_COMPOSE_DOCUMENTATION.md",
             "QUICK_START_GUIDE.md",
@@ -95,34 +102,86 @@ class DistributionBuilder:
             "ENHANCED_END_TO_END_VALIDATION_SUMMARY.md",
         ]
         
-        for doc_file in doc_files:
-            src_file = self.root_dir / doc_file
-            if src_file.exists():
-                shutil.copy2(src_file, package_dir / doc_file)
+        # Skip the build entirely when none of the inputs changed
+        input_hash = self._manifest_hash(
+            (name, _IGNORE_BUILD_ARTIFACTS) for name in include_files + include_dirs + doc_files
+        )
+        cached_path = self._restore_cached_artifact("source_dist", input_hash)
+        if cached_path:
+            print(f"Source distribution reused from cache: {cached_path}")
+            return cached_path
+        
+        package_dir.mkdir()
+        
+        # One directory read instead of an exists() stat per entry
+        with os.scandir(self.root_dir) as entries:
+            root_entries = {entry.name for entry in entries}
+        
+        copy_pairs = [
+            (self.root_dir / name, package_dir / name)
+            for name in itertools.chain(include_files, doc_files)
+            if name in root_entries
+        ]
+        
+        # Copy files (independent copies, run them on a thread pool)
+        with ThreadPoolExecutor(max_workers=min(16, len(copy_pairs) or 1)) as executor:
+            list(executor.map(lambda pair: shutil.copy2(*pair), copy_pairs))
+        
+        # Copy directories
+        for dir_name in include_dirs:
+            if dir_name in root_entries:
+                shutil.copytree(self.root_dir / dir_name, package_dir / dir_name, 
+                              ignore=_IGNORE_BUILD_ARTIFACTS)
         
         # Create tarball
         tarball_path = self.dist_dir / f"{package_name}.tar.gz"
         with tarfile.open(tarball_path, "w:gz") as tar:
             tar.add(package_dir, arcname=package_name)
         
+        self._store_cached_artifact("source_dist", input_hash, tarball_path)
         print(f"Source distribution created: {tarball_path}")
         return tarball_path
     
     def build_binary_distribution(self) -> Path:
         """Build binary distribution (wheel)"""
+        import importlib.util
+        import subprocess
+        
         print("Building binary distribution...")
         
+        # Reuse a previously built wheel when none of its inputs changed;
+        # setup.py reads README.md and requirements.txt into the wheel metadata
+        input_hash = self._manifest_hash(
+            ((name, _IGNORE_BUILD_ARTIFACTS)
+             for name in ("cli-tool", "setup.py", "VERSION", "README.md", "requirements.txt")),
+            pattern="*.py"
+        )
+        cached_path = self._restore_cached_artifact("binary_dist", input_hash)
+        if cached_path:
+            print(f"Binary distribution reused from cache: {cached_path}")
+            return cached_path
+        
+        # Build wheel with the PEP 517 frontend (no isolated venv) when the
+        # 'build' package is installed, otherwise with setup.py as before.
+        # Our own build/ directory imports as a namespace package (no origin).
+        build_spec = importlib.util.find_spec("build")
+        if build_spec is not None and build_spec.origin is not None:
+            command = [sys.executable, "-m", "build", "--wheel", "--no-isolation",
+                       "--skip-dependency-check", "--outdir", str(self.dist_dir)]
+        else:
+            print("The 'build' package is not installed (pip install build); "
+                  "falling back to setup.py bdist_wheel")
+            command = [sys.executable, "setup.py", "bdist_wheel"]
+        
         try:
-            # Build wheel using setup.py
-            result = subprocess.run([
-                sys.executable, "setup.py", "bdist_wheel"
-            ], cwd=self.root_dir, capture_output=True, text=True)
+            result = subprocess.run(command, cwd=self.root_dir, capture_output=True, text=True)
             
             if result.returncode == 0:
                 # Find the created wheel
                 wheel_files = list(self.dist_dir.glob("*.whl"))
                 if wheel_files:
                     wheel_path = wheel_files[0]
+                    self._store_cached_artifact("binary_dist", input_hash, wheel_path)
                     print(f"Binary distribution created: {wheel_path}")
                     return wheel_path
             
@@ -135,67 +194,133 @@ class DistributionBuilder:
     
     def build_standalone_package(self) -> Path:
         """Build standalone package with all dependencies"""
+        import zipfile
+        
         print("Building standalone package...")
         
         package_name = f"multi-student-docker-compose-standalone-{self.version}"
-        package_dir = self.build_dir / package_name
-        package_dir.mkdir()
         
-        # Copy CLI tool
-        cli_dir = package_dir / "cli-tool"
-        shutil.copytree(self.root_dir / "cli-tool", cli_dir,
-                       ignore=shutil.ignore_patterns('__pycache__', '*.pyc', '*.pyo', '.pytest_cache'))
-        
-        # Copy templates
-        templates_dir = package_dir / "templates"
-        shutil.copytree(self.root_dir / "templates", templates_dir)
-        
-        # Copy examples
-        examples_dir = package_dir / "examples"
-        if (self.root_dir / "examples").exists():
-            shutil.copytree(self.root_dir / "examples", examples_dir)
-        
-        # Copy admin tools (without sensitive data)
-        admin_dir = package_dir / "admin-tools"
-        if (self.root_dir / "admin-tools").exists():
-            shutil.copytree(self.root_dir / "admin-tools", admin_dir,
-                           ignore=shutil.ignore_patterns('*.enc', '*.key', 'logs', 'backups'))
+        # (source dir, ignore callable) for each tree shipped in the package
+        sources = [
+            ("cli-tool", _IGNORE_BUILD_ARTIFACTS),
+            ("templates", None),
+            ("examples", None),
+            # Admin tools ship without sensitive data
+            ("admin-tools", _IGNORE_SENSITIVE),
+        ]
         
-        # Copy documentation
         docs = [
             "README.md",
             "MULTI_STUDENT_DOCKER_COMPOSE_DOCUMENTATION.md",
             "QUICK_START_GUIDE.md",
         ]
         
-        for doc in docs:
-            src_file = self.root_dir / doc
-            if src_file.exists():
-                shutil.copy2(src_file, package_dir / doc)
-        
-        # Create installation script
-        install_script = package_dir / "install.py"
-        self._create_install_script(install_script)
-        
-        # Create run script
-        run_script = package_dir / "run.py"
-        self._create_run_script(run_script)
-        
-        # Create ZIP package
+        # Skip the build entirely when none of the inputs changed; this script
+        # is hashed too since it generates install.py and run.py
+        input_hash = self._manifest_hash(sources + [
+            (name, None) for name in docs + ["VERSION", Path(__file__).name]
+        ])
+        cached_path = self._restore_cached_artifact("standalone_package", input_hash)
+        if cached_path:
+            print(f"Standalone package reused from cache: {cached_path}")
+            return cached_path
+        
+        # Stream every source file straight into the ZIP in a single walk,
+        # without staging a copy of the package under build/
         zip_path = self.dist_dir / f"{package_name}.zip"
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(package_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = file_path.relative_to(package_dir.parent)
+            for dir_name, ignore in sources:
+                src_dir = self.root_dir / dir_name
+                if not src_dir.is_dir():
+                    continue
+                for file_path in self._walk_files(src_dir, ignore):
+                    arcname = Path(package_name) / file_path.relative_to(self.root_dir)
                     zipf.write(file_path, arcname)
-        
+            
+            for doc in docs:
+                src_file = self.root_dir / doc
+                if src_file.exists():
+                    zipf.write(src_file, Path(package_name) / doc)
+            
+            # Installation and run scripts
+            for script_name, content in (("install.py", self._get_install_script_content()),
+                                         ("run.py", self._get_run_script_content())):
+                script_info = zipfile.ZipInfo(f"{package_name}/{script_name}")
+                script_info.compress_type = zipfile.ZIP_DEFLATED
+                script_info.external_attr = 0o100755 << 16
+                zipf.writestr(script_info, content)
+        
+        self._store_cached_artifact("standalone_package", input_hash, zip_path)
         print(f"Standalone package created: {zip_path}")
         return zip_path
     
-    def _create_install_script(self, script_path: Path):
-        """Create installation script for standalone package"""
-        install_script_content = '''#!/usr/bin/env python3
+    def _manifest_hash(self, sources, pattern: str = "*") -> str:
+        """
+        Hash the contents of files and directories under root_dir
+        
+        Args:
+            sources: (name, copytree-style ignore callable or None) pairs, so
+                directories are hashed with the same filter they are copied with
+            pattern: Only hash directory files whose name matches this pattern
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        
+        for name, ignore in sources:
+            src = self.root_dir / name
+            if src.is_dir():
+                files = sorted(f for f in self._walk_files(src, ignore)
+                               if fnmatch.fnmatch(f.name, pattern))
+            elif src.is_file():
+                files = [src]
+            else:
+                continue
+            
+            for file_path in files:
+                with open(file_path, 'rb') as f:
+                    # Frame each file as path NUL size NUL so different layouts
+                    # can never concatenate to the same byte stream
+                    size = os.fstat(f.fileno()).st_size
+                    relative = str(file_path.relative_to(self.root_dir)).encode()
+                    digest.update(b"%s\0%d\0" % (relative, size))
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+        
+        return digest.hexdigest()
+    
+    def _restore_cached_artifact(self, target: str, input_hash: str) -> Optional[Path]:
+        """Copy a cached artifact into dist/ if one exists for this input hash"""
+        marker = self.cache_dir / f"{target}-{input_hash}.marker"
+        if not marker.exists():
+            return None
+        
+        cached_artifact = self.cache_dir / marker.read_text().strip()
+        if not cached_artifact.exists():
+            return None
+        
+        artifact_path = self.dist_dir / cached_artifact.name.split("-", 1)[1]
+        shutil.copy2(cached_artifact, artifact_path)
+        return artifact_path
+    
+    def _store_cached_artifact(self, target: str, input_hash: str, artifact_path: Path):
+        """Store a built artifact and its marker in the build cache"""
+        self.cache_dir.mkdir(exist_ok=True)
+        cached_name = f"{input_hash}-{artifact_path.name}"
+        shutil.copy2(artifact_path, self.cache_dir / cached_name)
+        (self.cache_dir / f"{target}-{input_hash}.marker").write_text(cached_name)
+    
+    def _walk_files(self, src_dir: Path, ignore=None):
+        """Yield files under src_dir, honouring a copytree-style ignore callable"""
+        for root, dirs, files in os.walk(src_dir):
+            if ignore:
+                ignored = set(ignore(root, dirs + files))
+                dirs[:] = [d for d in dirs if d not in ignored]
+                files = [f for f in files if f not in ignored]
+            for file in sorted(files):
+                yield Path(root) / file
+    
+    def _get_install_script_content(self) -> str:
+        """Get installation script for standalone package"""
+        return '''#!/usr/bin/env python3
 """
 Installation script for Multi-Student Docker Compose CLI Tool
 """
@@ -246,12 +371,10 @@ def main():
 if __name__ == "__main__":
     main()
 '''
-        script_path.write_text(install_script_content)
-        script_path.chmod(0o755)
     
-    def _create_run_script(self, script_path: Path):
-        """Create run script for standalone package"""
-        run_script_content = '''#!/usr/bin/env python3
+    def _get_run_script_content(self) -> str:
+        """Get run script for standalone package"""
+        return '''#!/usr/bin/env python3
 """
 Run script for Multi-Student Docker Compose CLI Tool
 """
@@ -273,11 +396,11 @@ except ImportError as e:
     print("Make sure you're running from the correct directory")
     sys.exit(1)
 '''
-        script_path.write_text(run_script_content)
-        script_path.chmod(0o755)
     
     def build_docker_image(self) -> bool:
         """Build Docker image"""
+        import subprocess
+        
         print("Building Docker image...")
         
         # Create Dockerfile
@@ -3,13 +3,28 @@
 Demo of interactive project creation functionality
 """
 
+import io
 import os
 import sys
+from contextlib import redirect_stdout
 from cli import DockerComposeCLI
 
 
 def demo_interactive_functionality():
     """Demonstrate the interactive project creation"""
+    # Buffer the whole demo and emit it with a single write
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            _print_demo()
+    finally:
+        # Show what was printed even if the demo fails part way
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def _print_demo():
+    """Print the demo walkthrough"""
     print("🎯 Interactive Project Creation Demo")
     print("=" * 40)
     
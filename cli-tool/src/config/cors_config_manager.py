@@ -6,15 +6,23 @@ Handles generation of CORS (Cross-Origin Resource Sharing) configurations
 for different rendering scenarios (CSR/SSR) and container networking.
 """
 
+import bisect
+import heapq
 import os
-from typing import Dict, Any, List, Optional, Set
-from dataclasses import dataclass
+import sys
+from functools import lru_cache
+from typing import Dict, Any, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from dataclasses import dataclass, field
 from src.core.port_assignment import PortAssignment
 
 
-@dataclass
+# dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class CorsConfig:
-    """Configuration for CORS generation"""
+    """Configuration for CORS generation (immutable once created)"""
     username: str
     project_name: str
     template_type: str
@@ -22,8 +30,195 @@ class CorsConfig:
     has_common_project: bool
     frontend_port: int
     backend_port: int
-    additional_ports: Optional[List[int]] = None
-    custom_origins: Optional[List[str]] = None
+    additional_ports: Optional[Tuple[int, ...]] = None
+    custom_origins: Optional[Tuple[str, ...]] = None
+    all_ports_set: FrozenSet[int] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Store sequences as tuples so the frozen config cannot be mutated through them
+        if self.additional_ports is not None:
+            object.__setattr__(self, 'additional_ports', tuple(self.additional_ports))
+        if self.custom_origins is not None:
+            object.__setattr__(self, 'custom_origins', tuple(self.custom_origins))
+        
+        # Constant-time membership checks against the assigned ports
+        object.__setattr__(self, 'all_ports_set', frozenset(self.port_assignment.all_ports))
+
+
+class _CorsKey(NamedTuple):
+    """Hashable snapshot of the CorsConfig fields the origin generators depend on"""
+    username: str
+    template_type: str
+    has_common_project: bool
+    frontend_port: int
+    backend_port: int
+    all_ports: FrozenSet[int]
+    additional_ports: Tuple[int, ...]
+    custom_origins: Tuple[str, ...]
+
+
+def _cors_key(config: CorsConfig) -> _CorsKey:
+    """Build the cache key for a CORS configuration"""
+    return _CorsKey(
+        username=config.username,
+        template_type=config.template_type,
+        has_common_project=config.has_common_project,
+        frontend_port=config.frontend_port,
+        backend_port=config.backend_port,
+        all_ports=config.all_ports_set,
+        additional_ports=config.additional_ports or (),
+        custom_origins=config.custom_origins or (),
+    )
+
+
+def _port_order(ports) -> Tuple[int, ...]:
+    """Dedupe ports and sort them in the order their localhost origins sort in"""
+    return tuple(sorted(set(ports), key=str))
+
+
+def _merge_ports(*sorted_ports) -> List[int]:
+    """Linear merge of port sequences already in _port_order, dropping duplicates"""
+    merged = []
+    for port in heapq.merge(*sorted_ports, key=str):
+        if not merged or merged[-1] != port:
+            merged.append(port)
+    return merged
+
+
+def _merge_origins(*sorted_origins) -> List[str]:
+    """Linear merge of sorted origin sequences, dropping duplicates"""
+    merged = []
+    for origin in heapq.merge(*sorted_origins):
+        if not merged or merged[-1] != origin:
+            merged.append(origin)
+    return merged
+
+
+def _insort_origins(origins: List[str], extra_origins) -> None:
+    """Insert origins into an already sorted list, skipping ones already present"""
+    for origin in extra_origins:
+        index = bisect.bisect_left(origins, origin)
+        if index == len(origins) or origins[index] != origin:
+            origins.insert(index, origin)
+
+
+def _localhost_origins(ports) -> List[str]:
+    """Format ports as http://localhost origins, reusing the prebuilt common ones"""
+    prebuilt = _LOCALHOST_ORIGINS
+    return [prebuilt.get(port) or f'http://localhost:{port}' for port in ports]
+
+
+# Common development ports for frontend frameworks
+_COMMON_DEV_PORTS = _port_order((3000, 3001, 5173, 8080, 8081, 4200, 5000))
+
+# Common development tools and frameworks
+_DEV_TOOLS_PORTS = _port_order((
+    3000, 3001, 3002,  # React, Next.js
+    4200, 4201,        # Angular
+    5173, 5174,        # Vite
+    8080, 8081, 8082,  # Various dev servers
+    9000, 9001,        # Webpack dev server
+    5000, 5001,        # Flask, various
+))
+
+# Prebuilt, interned localhost origins for the well-known development ports
+_LOCALHOST_ORIGINS: Dict[int, str] = {
+    port: sys.intern(f'http://localhost:{port}')
+    for port in _COMMON_DEV_PORTS + _DEV_TOOLS_PORTS
+}
+
+# Common SSR ports for the frontend container
+_SSR_FRONTEND_PORTS = (3000, 3001, 8080)
+
+# (service, container suffix, port) for each template's container hostnames
+_HOSTNAME_SPECS: Dict[str, Tuple[Tuple[str, str, int], ...]] = {
+    'rag': (
+        ('frontend', 'rag-frontend', 3000),
+        ('backend', 'rag-backend', 8000),
+    ),
+    'agent': (
+        ('frontend', 'agent-frontend', 3000),
+        ('backend', 'agent-backend', 8000),
+        ('worker', 'agent-worker', 8001),
+    ),
+    # Common infrastructure services
+    'common': (
+        ('postgres', 'postgres', 5432),
+        ('mongodb', 'mongodb', 27017),
+        ('redis', 'redis', 6379),
+        ('chromadb', 'chromadb', 8000),
+        ('jaeger', 'jaeger', 16686),
+        ('prometheus', 'prometheus', 9090),
+        ('grafana', 'grafana', 3000),
+    ),
+}
+
+# Shared infrastructure reachable from projects using the common project
+_SHARED_INFRA_SPECS: Tuple[Tuple[str, str, int], ...] = (
+    ('postgres_shared', 'postgres', 5432),
+    ('mongodb_shared', 'mongodb', 27017),
+    ('redis_shared', 'redis', 6379),
+    ('chromadb_shared', 'chromadb', 8000),
+)
+
+
+class _CorsOrigins(NamedTuple):
+    """All origin lists and container hostnames derived from one CORS key"""
+    csr: Tuple[str, ...]
+    ssr: Tuple[str, ...]
+    development: Tuple[str, ...]
+    container_hostnames: Tuple[Tuple[str, str], ...]
+
+
+@lru_cache(maxsize=256)
+def _generate_all_origins(key: _CorsKey) -> _CorsOrigins:
+    """
+    Generate CSR, SSR and development origins plus container hostnames in one pass
+    
+    Each scenario extends the previous one (CSR ⊂ SSR ⊂ development), so the
+    lists are built incrementally from each other instead of recomputed.
+    Everything is returned as tuples so the cached value stays immutable.
+    """
+    # Container hostnames for Docker internal networking, used for SSR
+    # scenarios where containers talk to each other via Docker's DNS.
+    # Base container name pattern: {username}-{container}
+    specs = _HOSTNAME_SPECS.get(key.template_type, ())
+    if key.has_common_project and key.template_type != 'common':
+        # Add shared infrastructure hostnames if using common project
+        specs += _SHARED_INFRA_SPECS
+    hosts = {service: (f'{key.username}-{container}', port) for service, container, port in specs}
+    urls = {service: f'http://{host}:{port}' for service, (host, port) in hosts.items()}
+    
+    # CSR: the browser calls the backend API directly from localhost.
+    # Common development ports that fall in the student's assigned range,
+    # plus the frontend, backend (API docs, health checks) and additional ports
+    dev_ports = [port for port in _COMMON_DEV_PORTS if port in key.all_ports]
+    requested_ports = _port_order((key.frontend_port, key.backend_port) + key.additional_ports)
+    csr = _localhost_origins(_merge_ports(dev_ports, requested_ports))
+    _insort_origins(csr, key.custom_origins)
+    
+    # SSR: CSR origins (client-side hydration) plus container hostnames
+    # (server-side API calls during rendering)
+    container_origins = []
+    if 'frontend' in hosts:
+        frontend_host = hosts['frontend'][0]
+        container_origins.extend(f'http://{frontend_host}:{port}' for port in _SSR_FRONTEND_PORTS)
+    if 'backend' in hosts:
+        container_origins.append(urls['backend'])
+    if key.template_type == 'agent' and 'worker' in hosts:
+        # Worker service hostname (for agent projects)
+        container_origins.append(urls['worker'])
+    ssr = list(csr)
+    _insort_origins(ssr, container_origins)
+    
+    # Development: SSR origins plus every assigned port, common development
+    # tool ports and HTTPS variants for production-like testing
+    localhost_ports = _merge_ports(_port_order(key.all_ports), _DEV_TOOLS_PORTS)
+    development = _merge_origins(ssr, _localhost_origins(localhost_ports))
+    _insort_origins(development, (f'https://localhost:{key.frontend_port}',
+                                  f'https://localhost:{key.backend_port}'))
+    
+    return _CorsOrigins(tuple(csr), tuple(ssr), tuple(development), tuple(urls.items()))
 
 
 class CorsConfigManager:
@@ -43,23 +238,24 @@ class CorsConfigManager:
         Returns:
             Dictionary with CORS variables for template substitution
         """
-        # Generate CORS origins for different scenarios
-        csr_origins = self._generate_csr_origins(config)
-        ssr_origins = self._generate_ssr_origins(config)
-        development_origins = self._generate_development_origins(config)
-        container_hostnames = self._generate_container_hostnames(config)
+        # Generate CORS origins for different scenarios (memoized per config key)
+        origins = _generate_all_origins(_cors_key(config))
+        csr_origins = list(origins.csr)
+        ssr_origins = list(origins.ssr)
+        development_origins = list(origins.development)
+        container_hostnames = dict(origins.container_hostnames)
         
         return {
             # Client-Side Rendering (CSR) origins
-            'CORS_ORIGINS_CSR': ','.join(csr_origins),
+            'CORS_ORIGINS_CSR': ','.join(origins.csr),
             'CORS_ORIGINS_CSR_LIST': csr_origins,
             
             # Server-Side Rendering (SSR) origins
-            'CORS_ORIGINS_SSR': ','.join(ssr_origins),
+            'CORS_ORIGINS_SSR': ','.join(origins.ssr),
             'CORS_ORIGINS_SSR_LIST': ssr_origins,
             
             # Development origins (includes common dev ports)
-            'CORS_ORIGINS_DEV': ','.join(development_origins),
+            'CORS_ORIGINS_DEV': ','.join(origins.development),
             'CORS_ORIGINS_DEV_LIST': development_origins,
             
             # Container hostnames for internal communication
@@ -78,149 +274,20 @@ class CorsConfigManager:
         }
     
     def _generate_csr_origins(self, config: CorsConfig) -> List[str]:
-        """
-        Generate CORS origins for Client-Side Rendering (CSR)
-        
-        CSR applications run in the browser and make API calls directly
-        from localhost to the backend API.
-        """
-        origins = set()
-        
-        # Primary frontend origin
-        origins.add(f'http://localhost:{config.frontend_port}')
-        
-        # Backend origin (for API documentation, health checks)
-        origins.add(f'http://localhost:{config.backend_port}')
-        
-        # Common development ports for frontend frameworks
-        common_dev_ports = [3000, 3001, 5173, 8080, 8081, 4200, 5000]
-        for port in common_dev_ports:
-            if port in config.port_assignment.all_ports:
-                origins.add(f'http://localhost:{port}')
-        
-        # Additional ports if specified
-        if config.additional_ports:
-            for port in config.additional_ports:
-                origins.add(f'http://localhost:{port}')
-        
-        # Custom origins if specified
-        if config.custom_origins:
-            origins.update(config.custom_origins)
-        
-        return sorted(list(origins))
+        """Generate CORS origins for Client-Side Rendering (CSR)"""
+        return list(_generate_all_origins(_cors_key(config)).csr)
     
     def _generate_ssr_origins(self, config: CorsConfig) -> List[str]:
-        """
-        Generate CORS origins for Server-Side Rendering (SSR)
-        
-        SSR applications need both localhost origins (for client-side hydration)
-        and container hostnames (for server-side API calls during rendering).
-        """
-        origins = set()
-        
-        # Include all CSR origins
-        origins.update(self._generate_csr_origins(config))
-        
-        # Add container hostnames for SSR
-        container_hostnames = self._generate_container_hostnames(config)
-        
-        # Frontend container hostname (for SSR API calls)
-        if 'frontend' in container_hostnames:
-            frontend_hostname = container_hostnames['frontend']
-            # Common SSR ports
-            ssr_ports = [3000, 3001, 8080]
-            for port in ssr_ports:
-                origins.add(f'http://{frontend_hostname.split("://")[1].split(":")[0]}:{port}')
-        
-        # Backend container hostname
-        if 'backend' in container_hostnames:
-            origins.add(container_hostnames['backend'])
-        
-        # Worker service hostname (for agent projects)
-        if config.template_type == 'agent' and 'worker' in container_hostnames:
-            origins.add(container_hostnames['worker'])
-        
-        return sorted(list(origins))
+        """Generate CORS origins for Server-Side Rendering (SSR)"""
+        return list(_generate_all_origins(_cors_key(config)).ssr)
     
     def _generate_development_origins(self, config: CorsConfig) -> List[str]:
-        """
-        Generate comprehensive CORS origins for development
-        
-        Includes all possible development scenarios and common ports.
-        """
-        origins = set()
-        
-        # Include SSR origins (which include CSR origins)
-        origins.update(self._generate_ssr_origins(config))
-        
-        # Add all student's assigned ports as potential origins
-        for port in config.port_assignment.all_ports:
-            origins.add(f'http://localhost:{port}')
-        
-        # Common development tools and frameworks
-        dev_tools_ports = [
-            3000, 3001, 3002,  # React, Next.js
-            4200, 4201,        # Angular
-            5173, 5174,        # Vite
-            8080, 8081, 8082,  # Various dev servers
-            9000, 9001,        # Webpack dev server
-            5000, 5001,        # Flask, various
-        ]
-        
-        for port in dev_tools_ports:
-            origins.add(f'http://localhost:{port}')
-        
-        # HTTPS variants for production-like testing
-        origins.add(f'https://localhost:{config.frontend_port}')
-        origins.add(f'https://localhost:{config.backend_port}')
-        
-        return sorted(list(origins))
+        """Generate comprehensive CORS origins for development"""
+        return list(_generate_all_origins(_cors_key(config)).development)
     
     def _generate_container_hostnames(self, config: CorsConfig) -> Dict[str, str]:
-        """
-        Generate container hostnames for Docker internal networking
-        
-        These are used for SSR scenarios where containers need to
-        communicate with each other using Docker's internal DNS.
-        """
-        hostnames = {}
-        
-        # Base container name pattern: {username}-{service}
-        base_name = config.username
-        
-        if config.template_type == 'rag':
-            hostnames.update({
-                'frontend': f'http://{base_name}-rag-frontend:3000',
-                'backend': f'http://{base_name}-rag-backend:8000',
-            })
-        elif config.template_type == 'agent':
-            hostnames.update({
-                'frontend': f'http://{base_name}-agent-frontend:3000',
-                'backend': f'http://{base_name}-agent-backend:8000',
-                'worker': f'http://{base_name}-agent-worker:8001',
-            })
-        elif config.template_type == 'common':
-            # Common infrastructure services
-            hostnames.update({
-                'postgres': f'http://{base_name}-postgres:5432',
-                'mongodb': f'http://{base_name}-mongodb:27017',
-                'redis': f'http://{base_name}-redis:6379',
-                'chromadb': f'http://{base_name}-chromadb:8000',
-                'jaeger': f'http://{base_name}-jaeger:16686',
-                'prometheus': f'http://{base_name}-prometheus:9090',
-                'grafana': f'http://{base_name}-grafana:3000',
-            })
-        
-        # Add shared infrastructure hostnames if using common project
-        if config.has_common_project and config.template_type != 'common':
-            hostnames.update({
-                'postgres_shared': f'http://{base_name}-postgres:5432',
-                'mongodb_shared': f'http://{base_name}-mongodb:27017',
-                'redis_shared': f'http://{base_name}-redis:6379',
-                'chromadb_shared': f'http://{base_name}-chromadb:8000',
-            })
-        
-        return hostnames
+        """Generate container hostnames for Docker internal networking"""
+        return dict(_generate_all_origins(_cors_key(config)).container_hostnames)
     
     def generate_cors_documentation(self, config: CorsConfig) -> str:
         """
@@ -229,8 +296,13 @@ class CorsConfigManager:
         Returns markdown documentation explaining CORS setup for the project.
         """
         cors_config = self.generate_cors_config(config)
+        frontend_url = cors_config['FRONTEND_URL_LOCALHOST']
+        backend_url = cors_config['BACKEND_URL_LOCALHOST']
+        csr_origins = cors_config['CORS_ORIGINS_CSR']
+        ssr_origins = cors_config['CORS_ORIGINS_SSR']
         
-        doc = f"""## CORS Configuration Guide
+        parts: List[str] = []
+        parts.append(f"""## CORS Configuration Guide
 
 ### Understanding CORS in {config.template_type.upper()} Applications
 
@@ -238,8 +310,8 @@ CORS (Cross-Origin Resource Sharing) is crucial for web applications where your
 
 #### Your Project Configuration
 
-**Frontend URL:** `{cors_config['FRONTEND_URL_LOCALHOST']}`
-**Backend URL:** `{cors_config['BACKEND_URL_LOCALHOST']}`
+**Frontend URL:** `{frontend_url}`
+**Backend URL:** `{backend_url}`
 
 ### Client-Side Rendering (CSR) Configuration
 
@@ -247,32 +319,28 @@ For React, Vue, Angular, and other client-side frameworks:
 
 ```bash
 # Backend .env configuration
-CORS_ORIGINS={cors_config['CORS_ORIGINS_CSR']}
+CORS_ORIGINS={csr_origins}
 ```
 
 **CSR Origins Include:**
-"""
-        
-        for origin in cors_config['CORS_ORIGINS_CSR_LIST']:
-            doc += f"- `{origin}`\n"
+""")
+        parts.extend(f"- `{origin}`\n" for origin in cors_config['CORS_ORIGINS_CSR_LIST'])
         
-        doc += f"""
+        parts.append(f"""
 ### Server-Side Rendering (SSR) Configuration
 
 For Next.js, Nuxt.js, SvelteKit, and other SSR frameworks:
 
 ```bash
 # Backend .env configuration for SSR
-CORS_ORIGINS={cors_config['CORS_ORIGINS_SSR']}
+CORS_ORIGINS={ssr_origins}
 ```
 
 **SSR Origins Include:**
-"""
-        
-        for origin in cors_config['CORS_ORIGINS_SSR_LIST']:
-            doc += f"- `{origin}`\n"
+""")
+        parts.extend(f"- `{origin}`\n" for origin in cors_config['CORS_ORIGINS_SSR_LIST'])
         
-        doc += f"""
+        parts.append("""
 **Why SSR needs different CORS:**
 - **CSR**: Browser makes API calls directly from localhost
 - **SSR**: Server makes API calls from container hostname during rendering
@@ -281,12 +349,11 @@ CORS_ORIGINS={cors_config['CORS_ORIGINS_SSR']}
 
 When services need to communicate within Docker:
 
-"""
-        
-        for service, hostname in cors_config['CONTAINER_HOSTNAMES'].items():
-            doc += f"- **{service.title()}**: `{hostname}`\n"
+""")
+        parts.extend(f"- **{service.title()}**: `{hostname}`\n"
+                     for service, hostname in cors_config['CONTAINER_HOSTNAMES'].items())
         
-        doc += f"""
+        parts.append(f"""
 ### Development Configuration
 
 For comprehensive development support (includes all common dev ports):
@@ -304,14 +371,14 @@ CORS_ORIGINS={cors_config['CORS_ORIGINS_DEV']}
 1. **Exact origin matching:**
    ```bash
    # Make sure CORS_ORIGINS matches exactly (including http://)
-   CORS_ORIGINS={cors_config['FRONTEND_URL_LOCALHOST']}  # ✅ Correct
+   CORS_ORIGINS={frontend_url}  # ✅ Correct
    CORS_ORIGINS=localhost:{config.frontend_port}         # ❌ Missing protocol
    ```
 
 2. **Multiple development ports:**
    ```bash
    # Support multiple development ports
-   CORS_ORIGINS={cors_config['CORS_ORIGINS_CSR']}
+   CORS_ORIGINS={csr_origins}
    ```
 
 #### Issue: SSR hydration errors
@@ -319,7 +386,7 @@ CORS_ORIGINS={cors_config['CORS_ORIGINS_DEV']}
 **Solutions:**
 1. **Add container hostnames to CORS:**
    ```bash
-   CORS_ORIGINS={cors_config['CORS_ORIGINS_SSR']}
+   CORS_ORIGINS={ssr_origins}
    ```
 
 2. **Check internal service URLs:**
@@ -332,13 +399,13 @@ CORS_ORIGINS={cors_config['CORS_ORIGINS_DEV']}
 
 ```bash
 # Test CORS headers
-curl -H "Origin: {cors_config['FRONTEND_URL_LOCALHOST']}" \\
+curl -H "Origin: {frontend_url}" \\
      -H "Access-Control-Request-Method: GET" \\
      -H "Access-Control-Request-Headers: Content-Type" \\
-     -X OPTIONS {cors_config['BACKEND_URL_LOCALHOST']}/api/health
+     -X OPTIONS {backend_url}/api/health
 
 # Expected response should include:
-# Access-Control-Allow-Origin: {cors_config['FRONTEND_URL_LOCALHOST']}
+# Access-Control-Allow-Origin: {frontend_url}
 # Access-Control-Allow-Methods: GET, POST, PUT, DELETE, OPTIONS
 ```
 
@@ -346,21 +413,21 @@ curl -H "Origin: {cors_config['FRONTEND_URL_LOCALHOST']}" \\
 
 #### Local Development
 ```bash
-CORS_ORIGINS={cors_config['CORS_ORIGINS_CSR']}
+CORS_ORIGINS={csr_origins}
 ```
 
 #### Docker Development
 ```bash
-CORS_ORIGINS={cors_config['CORS_ORIGINS_SSR']}
+CORS_ORIGINS={ssr_origins}
 ```
 
 #### Production (adjust domains as needed)
 ```bash
 CORS_ORIGINS=https://yourdomain.com,https://www.yourdomain.com
 ```
-"""
+""")
         
-        return doc
+        return ''.join(parts)
     
     def validate_cors_config(self, config: CorsConfig) -> List[str]:
         """
@@ -374,11 +441,13 @@ CORS_ORIGINS=https://yourdomain.com,https://www.yourdomain.com
         """
         issues = []
         
+        all_ports = config.all_ports_set
+        
         # Check port assignments
-        if config.frontend_port not in config.port_assignment.all_ports:
+        if config.frontend_port not in all_ports:
             issues.append(f"Frontend port {config.frontend_port} not in assigned port range")
         
-        if config.backend_port not in config.port_assignment.all_ports:
+        if config.backend_port not in all_ports:
             issues.append(f"Backend port {config.backend_port} not in assigned port range")
         
         # Check for port conflicts
@@ -388,7 +457,7 @@ CORS_ORIGINS=https://yourdomain.com,https://www.yourdomain.com
         # Check additional ports
         if config.additional_ports:
             for port in config.additional_ports:
-                if port not in config.port_assignment.all_ports:
+                if port not in all_ports:
                     issues.append(f"Additional port {port} not in assigned port range")
         
         # Validate custom origins format
@@ -427,11 +496,17 @@ def create_cors_config(username: str, project_name: str, template_type: str,
     # Auto-assign ports if not specified
     if frontend_port is None:
         # Frontend typically gets the 9th port (index 8)
-        frontend_port = all_ports[8] if len(all_ports) > 8 else all_ports[-1]
+        try:
+            frontend_port = all_ports[8]
+        except IndexError:
+            frontend_port = all_ports[-1]
     
     if backend_port is None:
         # Backend typically gets the 8th port (index 7)
-        backend_port = all_ports[7] if len(all_ports) > 7 else all_ports[-2]
+        try:
+            backend_port = all_ports[7]
+        except IndexError:
+            backend_port = all_ports[-2]
     
     return CorsConfig(
         username=username,
@@ -441,8 +516,8 @@ def create_cors_config(username: str, project_name: str, template_type: str,
         has_common_project=has_common_project,
         frontend_port=frontend_port,
         backend_port=backend_port,
-        additional_ports=additional_ports,
-        custom_origins=custom_origins
+        additional_ports=tuple(additional_ports) if additional_ports else None,
+        custom_origins=tuple(custom_origins) if custom_origins else None
     )
 
 
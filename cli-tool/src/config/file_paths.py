@@ -6,7 +6,8 @@ This module defines the canonical file paths for different project templates
 to ensure consistency between Docker Compose volume mounts and file generation.
 """
 
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 
 # Template file path configurations
 TEMPLATE_FILE_PATHS = {
@@ -86,6 +87,48 @@ TEMPLATE_SOURCE_PATHS = {
     }
 }
 
+# Flattened (template_type, file_type) -> path views for single-lookup access
+_FLAT_OUTPUT_PATHS = MappingProxyType({
+    (template_type, file_type): path
+    for template_type, paths in TEMPLATE_FILE_PATHS.items()
+    for file_type, path in paths.items()
+})
+
+_FLAT_SOURCE_PATHS = MappingProxyType({
+    (template_type, file_type): path
+    for template_type, paths in TEMPLATE_SOURCE_PATHS.items()
+    for file_type, path in paths.items()
+})
+
+# Read-only per-template views shared by every get_all_output_paths() caller
+_READONLY_OUTPUT_PATHS = {
+    template_type: MappingProxyType(paths)
+    for template_type, paths in TEMPLATE_FILE_PATHS.items()
+}
+
+# Database initialization files per template, resolved once at import
+_DATABASE_FILE_PATHS = {
+    template_type: tuple(
+        path for file_type, path in paths.items()
+        if 'init' in file_type and ('postgresql' in file_type or 'mongodb' in file_type)
+    )
+    for template_type, paths in TEMPLATE_FILE_PATHS.items()
+}
+
+# File types every template must define
+_REQUIRED_FILE_TYPES = frozenset(('docker_compose', 'readme', 'setup_script'))
+
+
+def _lookup_path(flat_paths: Mapping[Tuple[str, str], str], nested_paths: Dict[str, Dict[str, str]],
+                 template_type: str, file_type: str) -> str:
+    """Look up a path by flat key, raising the descriptive KeyError on a miss"""
+    try:
+        return flat_paths[(template_type, file_type)]
+    except KeyError:
+        if template_type not in nested_paths:
+            raise KeyError(f"Unknown template type: {template_type}") from None
+        raise KeyError(f"Unknown file type '{file_type}' for template '{template_type}'") from None
+
 
 def get_output_path(template_type: str, file_type: str) -> str:
     """
@@ -101,13 +144,7 @@ def get_output_path(template_type: str, file_type: str) -> str:
     Raises:
         KeyError: If template_type or file_type is not found
     """
-    if template_type not in TEMPLATE_FILE_PATHS:
-        raise KeyError(f"Unknown template type: {template_type}")
-    
-    if file_type not in TEMPLATE_FILE_PATHS[template_type]:
-        raise KeyError(f"Unknown file type '{file_type}' for template '{template_type}'")
-    
-    return TEMPLATE_FILE_PATHS[template_type][file_type]
+    return _lookup_path(_FLAT_OUTPUT_PATHS, TEMPLATE_FILE_PATHS, template_type, file_type)
 
 
 def get_template_source_path(template_type: str, file_type: str) -> str:
@@ -124,16 +161,10 @@ def get_template_source_path(template_type: str, file_type: str) -> str:
     Raises:
         KeyError: If template_type or file_type is not found
     """
-    if template_type not in TEMPLATE_SOURCE_PATHS:
-        raise KeyError(f"Unknown template type: {template_type}")
-    
-    if file_type not in TEMPLATE_SOURCE_PATHS[template_type]:
-        raise KeyError(f"Unknown file type '{file_type}' for template '{template_type}'")
-    
-    return TEMPLATE_SOURCE_PATHS[template_type][file_type]
+    return _lookup_path(_FLAT_SOURCE_PATHS, TEMPLATE_SOURCE_PATHS, template_type, file_type)
 
 
-def get_all_output_paths(template_type: str) -> Dict[str, str]:
+def get_all_output_paths(template_type: str) -> Mapping[str, str]:
     """
     Get all output paths for a template type
     
@@ -141,12 +172,13 @@ def get_all_output_paths(template_type: str) -> Dict[str, str]:
         template_type: Type of template (common, rag, agent)
         
     Returns:
-        Dictionary mapping file types to output paths
+        Read-only mapping of file types to output paths (call .copy()
+        for a mutable dict)
     """
-    if template_type not in TEMPLATE_FILE_PATHS:
+    if template_type not in _READONLY_OUTPUT_PATHS:
         raise KeyError(f"Unknown template type: {template_type}")
     
-    return TEMPLATE_FILE_PATHS[template_type].copy()
+    return _READONLY_OUTPUT_PATHS[template_type]
 
 
 def get_database_file_paths(template_type: str) -> List[str]:
@@ -159,14 +191,7 @@ def get_database_file_paths(template_type: str) -> List[str]:
     Returns:
         List of database file paths
     """
-    paths = []
-    template_paths = TEMPLATE_FILE_PATHS.get(template_type, {})
-    
-    for file_type, path in template_paths.items():
-        if 'init' in file_type and ('postgresql' in file_type or 'mongodb' in file_type):
-            paths.append(path)
-    
-    return paths
+    return list(_DATABASE_FILE_PATHS.get(template_type, ()))
 
 
 def validate_template_consistency() -> List[str]:
@@ -179,22 +204,18 @@ def validate_template_consistency() -> List[str]:
     issues = []
     
     # Check that all template types have required files
-    required_files = ['docker_compose', 'readme', 'setup_script']
-    
-    for template_type in TEMPLATE_FILE_PATHS:
-        for required_file in required_files:
-            if required_file not in TEMPLATE_FILE_PATHS[template_type]:
-                issues.append(f"Template '{template_type}' missing required file: {required_file}")
+    for template_type, output_paths in TEMPLATE_FILE_PATHS.items():
+        for required_file in sorted(_REQUIRED_FILE_TYPES - output_paths.keys()):
+            issues.append(f"Template '{template_type}' missing required file: {required_file}")
     
     # Check that source paths exist for all output paths
-    for template_type in TEMPLATE_FILE_PATHS:
+    for template_type, output_paths in TEMPLATE_FILE_PATHS.items():
         if template_type not in TEMPLATE_SOURCE_PATHS:
             issues.append(f"No source paths defined for template type: {template_type}")
             continue
-            
-        for file_type in TEMPLATE_FILE_PATHS[template_type]:
-            if file_type not in TEMPLATE_SOURCE_PATHS[template_type]:
-                issues.append(f"No source path for {template_type}.{file_type}")
+        
+        for file_type in sorted(output_paths.keys() - TEMPLATE_SOURCE_PATHS[template_type].keys()):
+            issues.append(f"No source path for {template_type}.{file_type}")
     
     return issues
 
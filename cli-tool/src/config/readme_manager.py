@@ -7,10 +7,52 @@ CORS configuration, Docker commands, and troubleshooting guides.
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Any, FrozenSet, List, NamedTuple, Optional, Set, Tuple
 from dataclasses import dataclass
 from src.core.port_assignment import PortAssignment
 from src.config.cors_config_manager import CorsConfigManager, create_cors_config
+from src.utils.file_utils import atomic_write_bytes, read_template_text
+
+
+# Template placeholders ({{VARIABLE}}) and conditional blocks, compiled once
+_VAR_RE = re.compile(r'\{\{([^{}]*)\}\}')
+_IF_RE = re.compile(r'\{\{#if\s+([^}]+)\}\}(.*?)(?:\{\{else\}\}(.*?))?\{\{/if\}\}', re.DOTALL)
+# Template validation: every {{...}} tag, and the shape of a well-formed variable
+_TAG_RE = re.compile(r'\{\{[^}]*\}\}')
+_WELL_FORMED_VAR_RE = re.compile(r'\{\{[A-Z_]+\}\}')
+
+
+# Service port variables, assigned sequentially from the student's ports:
+# common infrastructure ports first, then application ports
+_PORT_KEYS = (
+    'POSTGRES_PORT', 'MONGODB_PORT', 'REDIS_PORT', 'CHROMADB_PORT',
+    'JAEGER_UI_PORT', 'PROMETHEUS_PORT', 'GRAFANA_PORT',
+    'BACKEND_PORT', 'FRONTEND_PORT', 'WORKER_PORT',
+)
+
+# Variables every README template is expected to use
+_REQUIRED_TEMPLATE_VARS = (
+    'USERNAME', 'PROJECT_NAME', 'BACKEND_PORT', 'FRONTEND_PORT',
+    'POSTGRES_PORT', 'CORS_ORIGINS_CSR',
+)
+
+
+class _CompiledTemplate(NamedTuple):
+    """A README template translated to a format string plus its placeholder names"""
+    text: str
+    keys: FrozenSet[str]
+    # (format field, placeholder name) for names format_map cannot address directly
+    aliases: Tuple[Tuple[str, str], ...] = ()
+
+
+class _TemplateVariables(dict):
+    """format_map() mapping that renders unknown placeholders back as {{NAME}}"""
+    
+    def __missing__(self, key: str) -> str:
+        return f"{{{{{key}}}}}"
 
 
 @dataclass
@@ -36,13 +78,24 @@ class ReadmeManager:
             templates_dir: Directory containing template files
         """
         self.templates_dir = templates_dir
+        
+        # Compiled format strings per (template path, mtime)
+        self._compiled_templates: Dict[Tuple[str, float], _CompiledTemplate] = {}
+        
+        # Template types whose README template is known to exist on disk
+        self._known_templates: Set[str] = set()
+        
+        # Shared CORS manager (stateless, reused across READMEs)
+        self._cors_manager = CorsConfigManager()
     
-    def create_readme_file(self, config: ReadmeConfig) -> str:
+    def create_readme_file(self, config: ReadmeConfig, drop_page_cache: bool = False) -> str:
         """
         Create README file from template with student-specific configuration
         
         Args:
             config: README generation configuration
+            drop_page_cache: Advise the kernel to evict the written file from
+                the page cache (used for large batches, ignored where unsupported)
             
         Returns:
             Path to generated README file
@@ -55,97 +108,85 @@ class ReadmeManager:
         
         # Process template
         readme_content = self._process_readme_template(template_path, variables)
+        data = readme_content.encode('utf-8')
         
-        # Write README file
+        # Write README file atomically: a crash never leaves a partial README
         readme_path = os.path.join(config.output_dir, "README.md")
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        atomic_write_bytes(readme_path, data, drop_page_cache=drop_page_cache)
         
         return readme_path
     
+    def create_readme_files_bulk(self, configs: List[ReadmeConfig],
+                                 max_workers: Optional[int] = None) -> List[str]:
+        """
+        Create README files for many students concurrently
+        
+        Templates are resolved and compiled once up front, then rendering
+        and writing run on a thread pool (file writes release the GIL).
+        
+        Args:
+            configs: README generation configurations, one per README
+            max_workers: Thread pool size (defaults to min(32, len(configs)))
+            
+        Returns:
+            Paths to generated README files, in the same order as configs
+        """
+        if not configs:
+            return []
+        
+        # Warm the template caches so worker threads only render and write
+        for template_type in {config.template_type for config in configs}:
+            self._compile_readme_template(self._get_readme_template_path(template_type))
+        
+        with ThreadPoolExecutor(max_workers=max_workers or min(32, len(configs))) as executor:
+            return list(executor.map(partial(self.create_readme_file, drop_page_cache=True), configs))
+    
     def _generate_readme_variables(self, config: ReadmeConfig) -> Dict[str, Any]:
         """Generate template variables for README"""
-        # Get port assignments
-        all_ports = config.port_assignment.all_ports
+        # Get port assignments; all_ports is rebuilt on every property access
+        port_assignment = config.port_assignment
+        all_ports = tuple(port_assignment.all_ports)
+        has_two_segments = port_assignment.has_two_segments
         
-        # Basic variables
-        variables = {
-            'USERNAME': config.username,
-            'PROJECT_NAME': config.project_name,
-            'TEMPLATE_TYPE': config.template_type,
-            'TOTAL_PORTS': len(all_ports),
-            'SEGMENT1_START': config.port_assignment.segment1_start,
-            'SEGMENT1_END': config.port_assignment.segment1_end,
-            'HAS_TWO_SEGMENTS': config.port_assignment.has_two_segments,
-        }
-        
-        # Add segment2 info if available
-        if config.port_assignment.has_two_segments:
-            variables.update({
-                'SEGMENT2_START': config.port_assignment.segment2_start,
-                'SEGMENT2_END': config.port_assignment.segment2_end,
-            })
-        
-        # Port assignments (sequential from available ports)
-        port_index = 0
-        service_ports = {}
-        
-        # Common infrastructure ports (first 7 ports)
-        if len(all_ports) > port_index:
-            service_ports['POSTGRES_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['MONGODB_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['REDIS_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['CHROMADB_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['JAEGER_UI_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['PROMETHEUS_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['GRAFANA_PORT'] = all_ports[port_index]
-            port_index += 1
-        
-        # Application ports (next available ports)
-        if len(all_ports) > port_index:
-            service_ports['BACKEND_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['FRONTEND_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['WORKER_PORT'] = all_ports[port_index]
-            port_index += 1
-        
-        variables.update(service_ports)
+        # Port assignments (sequential from available ports; zip stops at the shorter)
+        service_ports = dict(zip(_PORT_KEYS, all_ports))
         
         # CORS configuration using CORS manager
-        cors_manager = CorsConfigManager()
         cors_config = create_cors_config(
             username=config.username,
             project_name=config.project_name,
             template_type=config.template_type,
-            port_assignment=config.port_assignment,
+            port_assignment=port_assignment,
             has_common_project=config.has_common_project,
             frontend_port=service_ports.get('FRONTEND_PORT'),
             backend_port=service_ports.get('BACKEND_PORT')
         )
-        cors_variables = cors_manager.generate_cors_config(cors_config)
-        variables.update(cors_variables)
+        cors_variables = self._cors_manager.generate_cors_config(cors_config)
         
-        # Common project configuration
-        variables['HAS_COMMON_PROJECT'] = config.has_common_project
+        # Add segment2 info if available
+        segment2 = {
+            'SEGMENT2_START': port_assignment.segment2_start,
+            'SEGMENT2_END': port_assignment.segment2_end,
+        } if has_two_segments else {}
         
-        # Custom variables
-        if config.custom_variables:
-            variables.update(config.custom_variables)
+        # Build the bag in one literal so the dict is sized once; later
+        # entries win: basic < segment2 < service ports < CORS < common project < custom
+        variables = {
+            'USERNAME': config.username,
+            'PROJECT_NAME': config.project_name,
+            'TEMPLATE_TYPE': config.template_type,
+            'TOTAL_PORTS': len(all_ports),
+            'SEGMENT1_START': port_assignment.segment1_start,
+            'SEGMENT1_END': port_assignment.segment1_end,
+            'HAS_TWO_SEGMENTS': has_two_segments,
+            **segment2,
+            **service_ports,
+            **cors_variables,
+            # Common project configuration
+            'HAS_COMMON_PROJECT': config.has_common_project,
+            # Custom variables
+            **(config.custom_variables or {}),
+        }
         
         return variables
     
@@ -154,17 +195,38 @@ class ReadmeManager:
         """Get path to README template for given template type"""
         template_path = os.path.join(self.templates_dir, template_type, "README.md.template")
         
+        if template_type in self._known_templates:
+            return template_path
+        
         if not os.path.exists(template_path):
             # Create basic template if it doesn't exist
             self._create_basic_readme_template(template_type, template_path)
         
+        self._known_templates.add(template_type)
         return template_path
     
+    def _template_mtime(self, template_path: str) -> float:
+        """Stat a README template, recreating the basic one if it was deleted since it was seen"""
+        try:
+            return os.stat(template_path).st_mtime
+        except FileNotFoundError:
+            template_type = os.path.basename(os.path.dirname(template_path))
+            self._known_templates.discard(template_type)
+            self._get_readme_template_path(template_type)
+            return os.stat(template_path).st_mtime
+    
     def _create_basic_readme_template(self, template_type: str, template_path: str):
         """Create a basic README template if one doesn't exist"""
         os.makedirs(os.path.dirname(template_path), exist_ok=True)
         
-        basic_template = f"""# {{{{PROJECT_NAME}}}} Project - {{{{USERNAME}}}}
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write(self._basic_readme_template(template_type))
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _basic_readme_template(template_type: str) -> str:
+        """Body of the fallback README template, built once per template type"""
+        return f"""# {{{{PROJECT_NAME}}}} Project - {{{{USERNAME}}}}
 
 ## Overview
 
@@ -246,21 +308,59 @@ docker build -t {{{{USERNAME}}}}-{template_type}-frontend:latest ./frontend/
 
 For more help, contact your instructor or check the project documentation.
 """
+    
+    def _compile_readme_template(self, template_path: str) -> _CompiledTemplate:
+        """
+        Compile a README template once per manager
         
-        with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(basic_template)
+        The {{VARIABLE}} template is translated into an equivalent
+        str.format_map() format string (literal braces escaped), so
+        rendering it for many students is one C-level pass instead of a
+        replace per variable. The placeholder names are frozen alongside it
+        so rendering can tell up front whether every key will resolve.
+        """
+        cache_key = (template_path, self._template_mtime(template_path))
+        compiled = self._compiled_templates.get(cache_key)
+        
+        if compiled is None:
+            segments = _VAR_RE.split(read_template_text(*cache_key))
+            keys = set()
+            aliases = []
+            for index, segment in enumerate(segments):
+                if index % 2 == 0 or segment.startswith(('#', '/')) or segment == 'else':
+                    # Literal text, or a block tag such as {{#if X}} kept verbatim
+                    literal = segment if index % 2 == 0 else f"{{{{{segment}}}}}"
+                    segments[index] = literal.replace('{', '{{').replace('}', '}}')
+                elif segment.isidentifier():
+                    segments[index] = f"{{{segment}}}"
+                    keys.add(segment)
+                else:
+                    # Names such as MY-VAR or 0 get a generated field; '@' never
+                    # starts an identifier, so it cannot shadow a real placeholder
+                    field = f"@{len(aliases)}"
+                    segments[index] = f"{{{field}}}"
+                    aliases.append((field, segment))
+            compiled = _CompiledTemplate(''.join(segments), frozenset(keys), tuple(aliases))
+            self._compiled_templates[cache_key] = compiled
+        
+        return compiled
     
     def _process_readme_template(self, template_path: str, variables: Dict[str, Any]) -> str:
         """Process README template with variable substitution"""
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
+        compiled = self._compile_readme_template(template_path)
         
-        # Simple template variable substitution
-        processed_content = template_content
+        # Template variable substitution; only when a placeholder has no value
+        # is the bag copied into a mapping that leaves it as-is
+        mapping = variables
+        if compiled.aliases:
+            mapping = dict(variables)
+            for field, name in compiled.aliases:
+                mapping[field] = variables[name] if name in variables else f"{{{{{name}}}}}"
         
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            processed_content = processed_content.replace(placeholder, str(value))
+        if mapping.keys() >= compiled.keys:
+            processed_content = compiled.text.format_map(mapping)
+        else:
+            processed_content = compiled.text.format_map(_TemplateVariables(mapping))
         
         # Handle conditional blocks (basic implementation)
         processed_content = self._process_conditional_blocks(processed_content, variables)
@@ -269,38 +369,22 @@ For more help, contact your instructor or check the project documentation.
     
     def _process_conditional_blocks(self, content: str, variables: Dict[str, Any]) -> str:
         """Process conditional blocks in template"""
-        import re
+        # Most templates have no conditionals; skip the regex scan entirely
+        if '{{#if' not in content:
+            return content
         
-        # Handle {{#if VARIABLE}} ... {{else}} ... {{/if}} blocks
+        # Handle {{#if VARIABLE}} ... {{else}} ... {{/if}} and
+        # {{#if VARIABLE}} ... {{/if}} blocks in a single pass
         def replace_if_block(match):
             condition = match.group(1).strip()
-            if_content = match.group(2)
-            else_content = match.group(3) if match.group(3) else ""
             
             # Check condition
             if condition in variables and variables[condition]:
-                return if_content
-            else:
-                return else_content
-        
-        # Pattern for {{#if CONDITION}} content {{else}} content {{/if}}
-        if_pattern = r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{else\}\}(.*?)\{\{/if\}\}'
-        content = re.sub(if_pattern, replace_if_block, content, flags=re.DOTALL)
-        
-        # Pattern for {{#if CONDITION}} content {{/if}} (no else)
-        if_pattern_no_else = r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{/if\}\}'
-        def replace_if_block_no_else(match):
-            condition = match.group(1).strip()
-            if_content = match.group(2)
-            
-            if condition in variables and variables[condition]:
-                return if_content
+                return match.group(2)
             else:
-                return ""
-        
-        content = re.sub(if_pattern_no_else, replace_if_block_no_else, content, flags=re.DOTALL)
+                return match.group(3) or ""
         
-        return content
+        return _IF_RE.sub(replace_if_block, content)
     
     def validate_readme_template(self, template_type: str) -> List[str]:
         """Validate README template for missing variables or issues"""
@@ -308,24 +392,17 @@ For more help, contact your instructor or check the project documentation.
         issues = []
         
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Check for common required variables
-            required_vars = [
-                'USERNAME', 'PROJECT_NAME', 'BACKEND_PORT', 'FRONTEND_PORT',
-                'POSTGRES_PORT', 'CORS_ORIGINS_CSR'
-            ]
+            # Shares the cached text used for rendering
+            content = read_template_text(template_path, self._template_mtime(template_path))
             
-            for var in required_vars:
-                if f"{{{{{var}}}}}" not in content:
-                    issues.append(f"Missing required variable: {var}")
+            # Check for common required variables (one scan collects every placeholder)
+            found_vars = {match.group(1) for match in _VAR_RE.finditer(content)}
+            issues.extend(f"Missing required variable: {var}"
+                          for var in _REQUIRED_TEMPLATE_VARS if var not in found_vars)
             
             # Check for malformed template syntax
-            import re
-            malformed_vars = re.findall(r'\{\{[^}]*\}\}', content)
-            for var in malformed_vars:
-                if not re.match(r'\{\{[A-Z_]+\}\}', var) and not var.startswith('{{#'):
+            for var in _TAG_RE.findall(content):
+                if not _WELL_FORMED_VAR_RE.match(var) and not var.startswith('{{#'):
                     issues.append(f"Potentially malformed variable: {var}")
             
         except Exception as e:
@@ -7,179 +7,69 @@ health checking, startup coordination, and error recovery guidance.
 """
 
 import os
-from typing import Dict, Any, List, Optional
+import re
+import sys
+import time
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from src.core.port_assignment import PortAssignment
 from src.config.cors_config_manager import generate_cors_variables
-
-
-@dataclass
-class SetupScriptConfig:
-    """Configuration for setup script generation"""
-    username: str
-    project_name: str
-    template_type: str
-    port_assignment: PortAssignment
-    has_common_project: bool
-    output_dir: str
-    services: List[str]
-    custom_variables: Optional[Dict[str, Any]] = None
-
-
-class SetupScriptManager:
-    """Manages setup script generation from templates"""
-    
-    def __init__(self, templates_dir: str = "templates"):
-        """
-        Initialize setup script manager
-        
-        Args:
-            templates_dir: Directory containing template files
-        """
-        self.templates_dir = templates_dir
-    
-    def create_setup_script(self, config: SetupScriptConfig) -> str:
-        """
-        Create setup script from template with intelligent features
-        
-        Args:
-            config: Setup script generation configuration
-            
-        Returns:
-            Path to generated setup script
-        """
-        # Generate template variables
-        variables = self._generate_setup_variables(config)
-        
-        # Get template path or create intelligent script
-        setup_content = self._generate_intelligent_setup_script(config, variables)
-        
-        # Write setup script
-        setup_path = os.path.join(config.output_dir, "setup.sh")
-        with open(setup_path, 'w', encoding='utf-8') as f:
-            f.write(setup_content)
-        
-        # Make script executable (on Unix systems)
-        try:
-            os.chmod(setup_path, 0o755)
-        except (OSError, AttributeError):
-            pass  # Windows or permission issues
-        
-        return setup_path
-    
-    def _generate_setup_script_content(self, config: SetupScriptConfig) -> str:
-        """Generate setup script content (main entry point)"""
-        # Generate variables
-        variables = self._generate_setup_variables(config)
-        
-        # Generate intelligent setup script
-        return self._generate_intelligent_setup_script(config, variables)
-    
-    def _generate_setup_variables(self, config: SetupScriptConfig) -> Dict[str, Any]:
-        """Generate template variables for setup script"""
-        # Get port assignments
-        all_ports = config.port_assignment.all_ports
-        
-        # Basic variables
-        variables = {
-            'USERNAME': config.username,
-            'PROJECT_NAME': config.project_name,
-            'TEMPLATE_TYPE': config.template_type,
-            'HAS_COMMON_PROJECT': config.has_common_project,
-            'SERVICES': config.services,
-            'TIMESTAMP': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        }
-        
-        # Port assignments (sequential from available ports)
-        port_index = 0
-        service_ports = {}
-        
-        # Common infrastructure ports (first 7 ports)
-        if len(all_ports) > port_index:
-            service_ports['POSTGRES_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['MONGODB_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['REDIS_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['CHROMADB_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['JAEGER_UI_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['PROMETHEUS_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['GRAFANA_PORT'] = all_ports[port_index]
-            port_index += 1
-        
-        # Application ports (next available ports)
-        if len(all_ports) > port_index:
-            service_ports['BACKEND_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['FRONTEND_PORT'] = all_ports[port_index]
-            port_index += 1
-        if len(all_ports) > port_index:
-            service_ports['WORKER_PORT'] = all_ports[port_index]
-            port_index += 1
-        
-        variables.update(service_ports)
-        
-        # CORS configuration
-        cors_variables = generate_cors_variables(
-            username=config.username,
-            project_name=config.project_name,
-            template_type=config.template_type,
-            port_assignment=config.port_assignment,
-            has_common_project=config.has_common_project,
-            frontend_port=service_ports.get('FRONTEND_PORT'),
-            backend_port=service_ports.get('BACKEND_PORT')
-        )
-        variables.update(cors_variables)
-        
-        # Custom variables
-        if config.custom_variables:
-            variables.update(config.custom_variables)
-        
-        return variables
-    
-    def _generate_intelligent_setup_script(self, config: SetupScriptConfig, variables: Dict[str, Any]) -> str:
-        """Generate intelligent setup script with advanced features"""
-        
-        # Check if template-specific setup script exists
-        template_path = os.path.join(self.templates_dir, config.template_type, "setup.sh.template")
-        
-        if os.path.exists(template_path):
-            # Use existing template and enhance it
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-            
-            # Process template variables
-            processed_content = self._process_template_variables(template_content, variables)
-            return processed_content
-        else:
-            # Generate intelligent setup script
-            return self._create_intelligent_setup_script(config, variables)
-    
-    def _create_intelligent_setup_script(self, config: SetupScriptConfig, variables: Dict[str, Any]) -> str:
-        """Create intelligent setup script with all advanced features"""
-        
-        script_content = f"""#!/bin/bash
-
-# Intelligent Setup Script for {config.project_name}
-# Template: {config.template_type}
-# User: {config.username}
-# Generated: {variables['TIMESTAMP']}
+from src.utils.file_utils import atomic_write_bytes, read_template_text
+
+
+# dataclass(slots=True) is only available on Python 3.10+
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Template placeholders ({{VARIABLE}}) and conditional blocks, compiled once
+_VAR_RE = re.compile(r'\{\{([^{}]*)\}\}')
+_IF_ELSE_RE = re.compile(r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{else\}\}(.*?)\{\{/if\}\}', re.DOTALL)
+_IF_RE = re.compile(r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{/if\}\}', re.DOTALL)
+_UNLESS_RE = re.compile(r'\{\{#unless\s+([^}]+)\}\}(.*?)\{\{/unless\}\}', re.DOTALL)
+
+# Service port variables, in the order ports are assigned
+_PORT_ORDER = (
+    'POSTGRES_PORT', 'MONGODB_PORT', 'REDIS_PORT', 'CHROMADB_PORT',
+    'JAEGER_UI_PORT', 'PROMETHEUS_PORT', 'GRAFANA_PORT',
+    'BACKEND_PORT', 'FRONTEND_PORT', 'WORKER_PORT',
+)
+
+# Services with a published port: (port variable, display name)
+_SERVICE_PORT_MAP: Dict[str, Tuple[str, str]] = {
+    'postgres': ('POSTGRES_PORT', 'PostgreSQL'),
+    'mongodb': ('MONGODB_PORT', 'MongoDB'),
+    'redis': ('REDIS_PORT', 'Redis'),
+    'chromadb': ('CHROMADB_PORT', 'ChromaDB'),
+    'jaeger': ('JAEGER_UI_PORT', 'Jaeger UI'),
+    'prometheus': ('PROMETHEUS_PORT', 'Prometheus'),
+    'grafana': ('GRAFANA_PORT', 'Grafana'),
+    'backend': ('BACKEND_PORT', 'Backend API'),
+    'frontend': ('FRONTEND_PORT', 'Frontend'),
+    'agent-backend': ('BACKEND_PORT', 'Agent Backend'),
+    'agent-frontend': ('FRONTEND_PORT', 'Agent Frontend'),
+    'agent-worker': ('WORKER_PORT', 'Agent Worker'),
+}
+
+# Placeholders every setup.sh.template must use
+_REQUIRED_VARS = ('USERNAME', 'PROJECT_NAME')
+
+# Fixed bash fragments of the intelligent setup script, rendered with
+# str.format_map(); fields are filled from _build_script_skeleton()
+_BASH_HEADER = """#!/bin/bash
+
+# Intelligent Setup Script for {project_name}
+# Template: {template_type}
+# User: {username}
+# Generated: {timestamp}
 
 set -e  # Exit on any error
 
-# Colors for output
+"""
+
+# Colors, output helpers and the error trap; static, so appended as-is
+_BASH_PRELUDE = """# Colors for output
 RED='\\033[0;31m'
 GREEN='\\033[0;32m'
 YELLOW='\\033[1;33m'
@@ -188,28 +78,28 @@ CYAN='\\033[0;36m'
 NC='\\033[0m' # No Color
 
 # Function to print colored output
-print_status() {{
-    echo -e "${{BLUE}}[INFO]${{NC}} $1"
-}}
+print_status() {
+    echo -e "${BLUE}[INFO]${NC} $1"
+}
 
-print_success() {{
-    echo -e "${{GREEN}}[SUCCESS]${{NC}} $1"
-}}
+print_success() {
+    echo -e "${GREEN}[SUCCESS]${NC} $1"
+}
 
-print_warning() {{
-    echo -e "${{YELLOW}}[WARNING]${{NC}} $1"
-}}
+print_warning() {
+    echo -e "${YELLOW}[WARNING]${NC} $1"
+}
 
-print_error() {{
-    echo -e "${{RED}}[ERROR]${{NC}} $1"
-}}
+print_error() {
+    echo -e "${RED}[ERROR]${NC} $1"
+}
 
-print_step() {{
-    echo -e "${{CYAN}}[STEP]${{NC}} $1"
-}}
+print_step() {
+    echo -e "${CYAN}[STEP]${NC} $1"
+}
 
 # Error handling function
-handle_error() {{
+handle_error() {
     local exit_code=$?
     local line_number=$1
     print_error "Setup failed at line $line_number with exit code $exit_code"
@@ -224,17 +114,19 @@ handle_error() {{
     echo "5. Restart Docker if needed"
     echo ""
     exit $exit_code
-}}
+}
 
 # Set up error handling
-trap 'handle_error ${{LINENO}}' ERR
+trap 'handle_error ${LINENO}' ERR
+
+"""
 
-echo "🚀 Setting up {config.project_name} ({config.template_type} project)"
+_BASH_ENVIRONMENT_CHECK = """echo "🚀 Setting up {project_name} ({template_type} project)"
 echo "=================================================="
-echo "👤 User: {config.username}"
-echo "📅 Started: {variables['TIMESTAMP']}"
-echo "🏗️  Template: {config.template_type}"
-echo "🔗 Mode: {'Shared infrastructure' if config.has_common_project else 'Self-contained'}"
+echo "👤 User: {username}"
+echo "📅 Started: {timestamp}"
+echo "🏗️  Template: {template_type}"
+echo "🔗 Mode: {mode}"
 echo ""
 
 # Step 1: Environment validation
@@ -283,13 +175,11 @@ print_success "docker-compose.yml is valid"
 
 """
 
-        # Add common project detection for shared mode
-        if config.has_common_project and config.template_type != 'common':
-            script_content += f"""
+_BASH_COMMON_CHECK = """
 # Step 2: Common infrastructure validation
 print_step "2. Validating common infrastructure..."
 
-NETWORK_NAME="{config.username}-network"
+NETWORK_NAME="{username}-network"
 print_status "Checking for common project network: $NETWORK_NAME"
 
 if docker network ls | grep -q "$NETWORK_NAME"; then
@@ -301,7 +191,7 @@ if docker network ls | grep -q "$NETWORK_NAME"; then
     RUNNING_SERVICES=0
     
     for service in "${{COMMON_SERVICES[@]}}"; do
-        if docker ps --format "table {{{{.Names}}}}" | grep -q "{config.username}-$service"; then
+        if docker ps --format "table {{{{.Names}}}}" | grep -q "{username}-$service"; then
             print_success "$service is running"
             ((RUNNING_SERVICES++))
         else
@@ -324,21 +214,15 @@ else
     print_status "Recovery steps:"
     echo "1. Navigate to common project: cd ../common"
     echo "2. Start common infrastructure: docker-compose up -d"
-    echo "3. Return to this project: cd ../{config.project_name}"
+    echo "3. Return to this project: cd ../{project_name}"
     echo "4. Run this script again"
     exit 1
 fi
 
 """
-        else:
-            script_content += """
-# Step 2: Network setup
-print_step "2. Setting up Docker network..."
 
-"""
-            if config.template_type == 'common':
-                script_content += f"""
-NETWORK_NAME="{config.username}-network"
+_BASH_NETWORK_CREATE = """
+NETWORK_NAME="{username}-network"
 print_status "Creating Docker network: $NETWORK_NAME"
 
 if docker network ls | grep -q "$NETWORK_NAME"; then
@@ -350,44 +234,9 @@ fi
 
 """
 
-        # Add port availability checking
-        script_content += """
-# Step 3: Port availability check
-print_step "3. Checking port availability..."
-
-"""
-        
-        # Generate port checking based on services
-        if config.services:
-            port_vars = []
-            port_names = []
-            
-            service_port_map = {
-                'postgres': ('POSTGRES_PORT', 'PostgreSQL'),
-                'mongodb': ('MONGODB_PORT', 'MongoDB'),
-                'redis': ('REDIS_PORT', 'Redis'),
-                'chromadb': ('CHROMADB_PORT', 'ChromaDB'),
-                'jaeger': ('JAEGER_UI_PORT', 'Jaeger UI'),
-                'prometheus': ('PROMETHEUS_PORT', 'Prometheus'),
-                'grafana': ('GRAFANA_PORT', 'Grafana'),
-                'backend': ('BACKEND_PORT', 'Backend API'),
-                'frontend': ('FRONTEND_PORT', 'Frontend'),
-                'agent-backend': ('BACKEND_PORT', 'Agent Backend'),
-                'agent-frontend': ('FRONTEND_PORT', 'Agent Frontend'),
-                'agent-worker': ('WORKER_PORT', 'Agent Worker')
-            }
-            
-            for service in config.services:
-                if service in service_port_map:
-                    port_var, port_name = service_port_map[service]
-                    if port_var in variables:
-                        port_vars.append(port_var)
-                        port_names.append(port_name)
-            
-            if port_vars:
-                script_content += f"""
-PORTS=({' '.join(f'${{{var}}}' for var in port_vars)})
-PORT_NAMES=({' '.join(f'"{name}"' for name in port_names)})
+_BASH_PORT_CHECK = """
+PORTS=({ports})
+PORT_NAMES=({port_names})
 
 for i in "${{!PORTS[@]}}"; do
     PORT=${{PORTS[$i]}}
@@ -407,83 +256,9 @@ done
 
 """
 
-        # Add database detection and initialization
-        script_content += """
-# Step 4: Database detection and initialization
-print_step "4. Detecting and preparing databases..."
-
-"""
-        
-        # Intelligent database detection
-        db_services = []
-        if 'postgres' in config.services or config.has_common_project:
-            db_services.append('postgres')
-        if 'mongodb' in config.services or config.has_common_project:
-            db_services.append('mongodb')
-        
-        if db_services:
-            script_content += """
-# Database detection
-"""
-            
-            if 'postgres' in db_services:
-                script_content += """
-# PostgreSQL detection
-if [ -f "database/init.sql" ] || [ -f "database/postgresql/init.sql" ]; then
-    print_success "PostgreSQL initialization script found"
-    DB_INIT_POSTGRES=true
-else
-    print_status "No PostgreSQL initialization script found"
-    DB_INIT_POSTGRES=false
-fi
-
-"""
-            
-            if 'mongodb' in db_services:
-                script_content += """
-# MongoDB detection
-if [ -f "database/init.js" ] || [ -f "database/mongodb/init.js" ]; then
-    print_success "MongoDB initialization script found"
-    DB_INIT_MONGODB=true
-else
-    print_status "No MongoDB initialization script found"
-    DB_INIT_MONGODB=false
-fi
-
-"""
-
-        # Add service startup with health checking
-        script_content += """
-# Step 5: Service startup and health checking
-print_step "5. Starting services with health monitoring..."
-
-# Pull latest images
-print_status "Pulling Docker images..."
-if ! docker-compose pull; then
-    print_warning "Failed to pull some images, continuing with local images"
-fi
-
-# Start services
-print_status "Starting services..."
-docker-compose up -d
-
-# Wait for services to initialize
-print_status "Waiting for services to initialize..."
-sleep 5
-
-# Health checking with retries
-print_status "Performing health checks..."
-MAX_RETRIES=12
-RETRY_INTERVAL=5
-HEALTHY_SERVICES=0
-TOTAL_SERVICES=0
-
-"""
-        
-        # Generate health checks for each service
-        if config.services:
-            for service in config.services:
-                script_content += f"""
+# Health check emitted per service: head, a service-specific probe, tail.
+# Fields: {service}, {user} (database user prefix), {port} (HTTP probes)
+_BASH_HEALTH_CHECK_HEAD = """
 # Health check for {service}
 print_status "Checking {service} health..."
 TOTAL_SERVICES=$((TOTAL_SERVICES + 1))
@@ -492,46 +267,52 @@ for ((i=1; i<=MAX_RETRIES; i++)); do
     if docker-compose ps {service} | grep -q "Up"; then
         # Additional service-specific health checks
 """
-                
-                # Service-specific health checks
-                if service == 'postgres':
-                    script_content += f"""        if docker-compose exec -T postgres pg_isready -U {config.username}_user >/dev/null 2>&1; then
+
+_BASH_HEALTH_CHECKS: Dict[str, str] = {
+    'postgres': """        if docker-compose exec -T postgres pg_isready -U {user}_user >/dev/null 2>&1; then
             print_success "{service} is healthy"
             HEALTHY_SERVICES=$((HEALTHY_SERVICES + 1))
             break
         fi
-"""
-                elif service == 'mongodb':
-                    script_content += f"""        if docker-compose exec -T mongodb mongosh --eval "db.adminCommand('ping')" >/dev/null 2>&1; then
+""",
+    'mongodb': """        if docker-compose exec -T mongodb mongosh --eval "db.adminCommand('ping')" >/dev/null 2>&1; then
             print_success "{service} is healthy"
             HEALTHY_SERVICES=$((HEALTHY_SERVICES + 1))
             break
         fi
-"""
-                elif service == 'redis':
-                    script_content += f"""        if docker-compose exec -T redis redis-cli ping >/dev/null 2>&1; then
+""",
+    'redis': """        if docker-compose exec -T redis redis-cli ping >/dev/null 2>&1; then
             print_success "{service} is healthy"
             HEALTHY_SERVICES=$((HEALTHY_SERVICES + 1))
             break
         fi
-"""
-                elif service in ['backend', 'frontend', 'agent-backend', 'agent-frontend', 'agent-worker']:
-                    port_var = 'BACKEND_PORT' if 'backend' in service else ('FRONTEND_PORT' if 'frontend' in service else 'WORKER_PORT')
-                    if port_var in variables:
-                        script_content += f"""        if curl -f http://localhost:{variables[port_var]}/health >/dev/null 2>&1; then
+""",
+}
+
+_BASH_HTTP_HEALTH_CHECK = """        if curl -f http://localhost:{port}/health >/dev/null 2>&1; then
             print_success "{service} is healthy"
             HEALTHY_SERVICES=$((HEALTHY_SERVICES + 1))
             break
         fi
 """
-                else:
-                    # Generic health check
-                    script_content += f"""        print_success "{service} is running"
+
+_BASH_GENERIC_HEALTH_CHECK = """        print_success "{service} is running"
         HEALTHY_SERVICES=$((HEALTHY_SERVICES + 1))
         break
 """
-                
-                script_content += f"""    fi
+
+# Probe per service: (bash fragment, port variable it needs or None)
+_HEALTH_CHECK_DISPATCH: Dict[str, Tuple[str, Optional[str]]] = {
+    **{service: (probe, None) for service, probe in _BASH_HEALTH_CHECKS.items()},
+    'backend': (_BASH_HTTP_HEALTH_CHECK, 'BACKEND_PORT'),
+    'frontend': (_BASH_HTTP_HEALTH_CHECK, 'FRONTEND_PORT'),
+    'agent-backend': (_BASH_HTTP_HEALTH_CHECK, 'BACKEND_PORT'),
+    'agent-frontend': (_BASH_HTTP_HEALTH_CHECK, 'FRONTEND_PORT'),
+    'agent-worker': (_BASH_HTTP_HEALTH_CHECK, 'WORKER_PORT'),
+}
+_GENERIC_HEALTH_CHECK = (_BASH_GENERIC_HEALTH_CHECK, None)
+
+_BASH_HEALTH_CHECK_TAIL = """    fi
     
     if [ $i -eq $MAX_RETRIES ]; then
         print_error "{service} failed to become healthy"
@@ -545,23 +326,14 @@ done
 
 """
 
-        # Add database initialization after services are healthy
-        if 'postgres' in config.services or 'mongodb' in config.services:
-            script_content += """
-# Step 6: Database initialization
-print_step "6. Initializing databases..."
-
-"""
-            
-            if 'postgres' in config.services or config.has_common_project:
-                script_content += f"""
+_BASH_POSTGRES_INIT = """
 # Initialize PostgreSQL if needed
 if [ "$DB_INIT_POSTGRES" = true ]; then
     print_status "Initializing PostgreSQL database..."
     
     # Wait for PostgreSQL to be ready
     for ((i=1; i<=30; i++)); do
-        if docker-compose exec -T postgres pg_isready -U {config.username}_user >/dev/null 2>&1; then
+        if docker-compose exec -T postgres pg_isready -U {username}_user >/dev/null 2>&1; then
             break
         fi
         sleep 1
@@ -570,19 +342,18 @@ if [ "$DB_INIT_POSTGRES" = true ]; then
     # Run initialization script
     if [ -f "database/init.sql" ]; then
         print_status "Running database/init.sql..."
-        docker-compose exec -T postgres psql -U {config.username}_user -d {config.project_name.replace('-', '_')} -f /docker-entrypoint-initdb.d/init.sql
+        docker-compose exec -T postgres psql -U {username}_user -d {project_db_name} -f /docker-entrypoint-initdb.d/init.sql
     elif [ -f "database/postgresql/init.sql" ]; then
         print_status "Running database/postgresql/init.sql..."
-        docker-compose exec -T postgres psql -U {config.username}_user -d {config.project_name.replace('-', '_')} -f /docker-entrypoint-initdb.d/init.sql
+        docker-compose exec -T postgres psql -U {username}_user -d {project_db_name} -f /docker-entrypoint-initdb.d/init.sql
     fi
     
     print_success "PostgreSQL database initialized"
 fi
 
 """
-            
-            if 'mongodb' in config.services or config.has_common_project:
-                script_content += f"""
+
+_BASH_MONGODB_INIT = """
 # Initialize MongoDB if needed
 if [ "$DB_INIT_MONGODB" = true ]; then
     print_status "Initializing MongoDB database..."
@@ -590,10 +361,10 @@ if [ "$DB_INIT_MONGODB" = true ]; then
     # Run initialization script
     if [ -f "database/init.js" ]; then
         print_status "Running database/init.js..."
-        docker-compose exec -T mongodb mongosh {config.project_name.replace('-', '_')} /docker-entrypoint-initdb.d/init.js
+        docker-compose exec -T mongodb mongosh {project_db_name} /docker-entrypoint-initdb.d/init.js
     elif [ -f "database/mongodb/init.js" ]; then
         print_status "Running database/mongodb/init.js..."
-        docker-compose exec -T mongodb mongosh {config.project_name.replace('-', '_')} /docker-entrypoint-initdb.d/init.js
+        docker-compose exec -T mongodb mongosh {project_db_name} /docker-entrypoint-initdb.d/init.js
     fi
     
     print_success "MongoDB database initialized"
@@ -601,8 +372,7 @@ fi
 
 """
 
-        # Final status and next steps
-        script_content += f"""
+_BASH_SUMMARY = """
 # Final status report
 echo ""
 echo "=================================================="
@@ -621,62 +391,54 @@ echo ""
 print_status "Service Access Information:"
 echo "=================================================="
 """
-        
-        # Add service access information based on template type
-        if config.template_type == 'common':
-            script_content += f"""
-echo "📊 Grafana Dashboard:    http://localhost:{variables.get('GRAFANA_PORT', 'N/A')}"
+
+_BASH_COMMON_ACCESS = """
+echo "📊 Grafana Dashboard:    http://localhost:{GRAFANA_PORT}"
 echo "   Username: admin"
-echo "   Password: {config.username}_password_2024"
+echo "   Password: {username}_password_2024"
 echo ""
-echo "🔍 Jaeger Tracing:       http://localhost:{variables.get('JAEGER_UI_PORT', 'N/A')}"
-echo "📈 Prometheus Metrics:   http://localhost:{variables.get('PROMETHEUS_PORT', 'N/A')}"
-echo "🗄️  PostgreSQL Database:  localhost:{variables.get('POSTGRES_PORT', 'N/A')}"
+echo "🔍 Jaeger Tracing:       http://localhost:{JAEGER_UI_PORT}"
+echo "📈 Prometheus Metrics:   http://localhost:{PROMETHEUS_PORT}"
+echo "🗄️  PostgreSQL Database:  localhost:{POSTGRES_PORT}"
 echo "   Database: shared_db"
-echo "   Username: {config.username}_user"
-echo "   Password: {config.username}_password_2024"
+echo "   Username: {username}_user"
+echo "   Password: {username}_password_2024"
 echo ""
-echo "📄 MongoDB Database:     localhost:{variables.get('MONGODB_PORT', 'N/A')}"
+echo "📄 MongoDB Database:     localhost:{MONGODB_PORT}"
 echo "   Database: shared_db"
-echo "   Username: {config.username}_admin"
-echo "   Password: {config.username}_password_2024"
+echo "   Username: {username}_admin"
+echo "   Password: {username}_password_2024"
 echo ""
-echo "⚡ Redis Cache:          localhost:{variables.get('REDIS_PORT', 'N/A')}"
-echo "   Password: {config.username}_redis_2024"
+echo "⚡ Redis Cache:          localhost:{REDIS_PORT}"
+echo "   Password: {username}_redis_2024"
 echo ""
-echo "🔍 ChromaDB Vector DB:   http://localhost:{variables.get('CHROMADB_PORT', 'N/A')}"
+echo "🔍 ChromaDB Vector DB:   http://localhost:{CHROMADB_PORT}"
 """
-        else:
-            # Application project access info
-            if 'backend' in config.services or 'agent-backend' in config.services:
-                script_content += f"""
-echo "🔧 Backend API:          http://localhost:{variables.get('BACKEND_PORT', 'N/A')}"
-echo "   Health check:         http://localhost:{variables.get('BACKEND_PORT', 'N/A')}/health"
-echo "   API docs:             http://localhost:{variables.get('BACKEND_PORT', 'N/A')}/docs"
+
+_BASH_BACKEND_ACCESS = """
+echo "🔧 Backend API:          http://localhost:{BACKEND_PORT}"
+echo "   Health check:         http://localhost:{BACKEND_PORT}/health"
+echo "   API docs:             http://localhost:{BACKEND_PORT}/docs"
 """
-            
-            if 'frontend' in config.services or 'agent-frontend' in config.services:
-                script_content += f"""
-echo "🌐 Frontend UI:          http://localhost:{variables.get('FRONTEND_PORT', 'N/A')}"
+
+_BASH_FRONTEND_ACCESS = """
+echo "🌐 Frontend UI:          http://localhost:{FRONTEND_PORT}"
 """
-            
-            if 'agent-worker' in config.services:
-                script_content += f"""
-echo "⚙️  Agent Worker:         http://localhost:{variables.get('WORKER_PORT', 'N/A')}"
+
+_BASH_WORKER_ACCESS = """
+echo "⚙️  Agent Worker:         http://localhost:{WORKER_PORT}"
 """
-            
-            if config.has_common_project:
-                script_content += f"""
+
+_BASH_SHARED_ACCESS = """
 echo ""
 echo "📊 Shared Infrastructure (from common project):"
-echo "   PostgreSQL:           localhost:{variables.get('POSTGRES_PORT', 'N/A')}"
-echo "   MongoDB:              localhost:{variables.get('MONGODB_PORT', 'N/A')}"
-echo "   Redis:                localhost:{variables.get('REDIS_PORT', 'N/A')}"
-echo "   ChromaDB:             http://localhost:{variables.get('CHROMADB_PORT', 'N/A')}"
+echo "   PostgreSQL:           localhost:{POSTGRES_PORT}"
+echo "   MongoDB:              localhost:{MONGODB_PORT}"
+echo "   Redis:                localhost:{REDIS_PORT}"
+echo "   ChromaDB:             http://localhost:{CHROMADB_PORT}"
 """
 
-        # Add final instructions
-        script_content += f"""
+_BASH_FINAL = """
 echo ""
 print_status "Next Steps:"
 echo "=================================================="
@@ -688,14 +450,14 @@ echo "5. 📚 Read README.md for detailed usage instructions"
 echo ""
 
 # Network information
-if [ "{config.template_type}" = "common" ] || [ "{config.has_common_project}" = "True" ]; then
+if [ "{template_type}" = "common" ] || [ "{has_common_project}" = "True" ]; then
     print_status "Network Information:"
     echo "=================================================="
-    echo "🌐 Shared Network: {config.username}-network"
+    echo "🌐 Shared Network: {username}-network"
     echo ""
     echo "Application projects can connect using:"
-    echo "  - Container hostnames: {config.username}-postgres, {config.username}-mongodb, etc."
-    echo "  - Localhost ports: localhost:{variables.get('POSTGRES_PORT', 'N/A')}, localhost:{variables.get('MONGODB_PORT', 'N/A')}, etc."
+    echo "  - Container hostnames: {username}-postgres, {username}-mongodb, etc."
+    echo "  - Localhost ports: localhost:{POSTGRES_PORT}, localhost:{MONGODB_PORT}, etc."
     echo ""
 fi
 
@@ -705,8 +467,401 @@ echo "=================================================="
 # Cleanup trap
 trap - ERR
 """
+
+
+def _expand_blocks(pattern: re.Pattern, content: str, variables: Dict[str, Any],
+                   negate: bool = False) -> str:
+    """
+    Replace each conditional block matched by pattern with its chosen branch
+    
+    Group 1 is the condition, group 2 the body and (for if/else patterns)
+    group 3 the else body. With negate, a block is kept only when its
+    variable is present and falsy ({{#unless}}).
+    """
+    has_else = pattern.groups >= 3
+    out = []
+    pos = 0
+    for match in pattern.finditer(content):
+        condition = match.group(1).strip()
+        if negate:
+            keep = condition in variables and not variables[condition]
+        else:
+            keep = condition in variables and variables[condition]
+        
+        out.append(content[pos:match.start()])
+        if keep:
+            out.append(match.group(2))
+        elif has_else:
+            out.append(match.group(3))
+        pos = match.end()
+    
+    if not out:
+        return content
+    out.append(content[pos:])
+    return "".join(out)
+
+
+@lru_cache(maxsize=1)
+def _timestamp(second: int) -> str:
+    """Format a generation timestamp once per second for batch runs"""
+    return datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+
+
+@lru_cache(maxsize=32)
+def _port_check_bash(checked_ports: Tuple[Tuple[str, str], ...]) -> str:
+    """Port availability check for (port variable, display name) pairs, shared across project shapes"""
+    port_vars, port_names = zip(*checked_ports)
+    return _BASH_PORT_CHECK.format(
+        ports=' '.join(f'${{{var}}}' for var in port_vars),
+        port_names=' '.join(f'"{name}"' for name in port_names),
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_script_skeleton(template_type: str, services: Tuple[str, ...],
+                           has_common_project: bool, assigned_port_vars: FrozenSet[str]) -> str:
+    """
+    Build the intelligent setup script for one project shape
+    
+    Everything student-specific (names, ports, timestamp) is emitted as a
+    {{PLACEHOLDER}} so students sharing a template, service list and mode
+    share one skeleton; _fill_skeleton() substitutes the values.
+    """
+    username = '{{USERNAME}}'
+    project_name = '{{PROJECT_NAME}}'
+    project_db_name = '{{PROJECT_DB_NAME}}'
+    variables = {var: f"{{{{{var}}}}}" for var in assigned_port_vars}
+    variables['TIMESTAMP'] = '{{TIMESTAMP}}'
+    
+    # Fields for the _BASH_* fragments
+    fields = {
+        'username': username,
+        'project_name': project_name,
+        'project_db_name': project_db_name,
+        'template_type': template_type,
+        'timestamp': variables['TIMESTAMP'],
+        'mode': 'Shared infrastructure' if has_common_project else 'Self-contained',
+        'has_common_project': has_common_project,
+    }
+    fields.update((var, variables.get(var, 'N/A')) for var in _PORT_ORDER)
+    
+    # Collect fragments and join once (repeated += copies the growing script)
+    parts = []
+    parts.append(_BASH_HEADER.format_map(fields))
+    parts.append(_BASH_PRELUDE)
+    parts.append(_BASH_ENVIRONMENT_CHECK.format_map(fields))
+
+    # Add common project detection for shared mode
+    if has_common_project and template_type != 'common':
+        parts.append(_BASH_COMMON_CHECK.format_map(fields))
+    else:
+        parts.append("""
+# Step 2: Network setup
+print_step "2. Setting up Docker network..."
+
+""")
+        if template_type == 'common':
+            parts.append(_BASH_NETWORK_CREATE.format_map(fields))
+
+    # Add port availability checking
+    parts.append("""
+# Step 3: Port availability check
+print_step "3. Checking port availability..."
+
+""")
+    
+    # Generate port checking based on services
+    if services:
+        # (port variable, display name) of each service with an assigned port
+        checked_ports = tuple(entry for entry in map(_SERVICE_PORT_MAP.get, services)
+                              if entry is not None and entry[0] in variables)
+        
+        if checked_ports:
+            parts.append(_port_check_bash(checked_ports))
+
+    # Add database detection and initialization
+    parts.append("""
+# Step 4: Database detection and initialization
+print_step "4. Detecting and preparing databases..."
+
+""")
+    
+    # Intelligent database detection
+    db_services = []
+    if 'postgres' in services or has_common_project:
+        db_services.append('postgres')
+    if 'mongodb' in services or has_common_project:
+        db_services.append('mongodb')
+    
+    if db_services:
+        parts.append("""
+# Database detection
+""")
+        
+        if 'postgres' in db_services:
+            parts.append("""
+# PostgreSQL detection
+if [ -f "database/init.sql" ] || [ -f "database/postgresql/init.sql" ]; then
+    print_success "PostgreSQL initialization script found"
+    DB_INIT_POSTGRES=true
+else
+    print_status "No PostgreSQL initialization script found"
+    DB_INIT_POSTGRES=false
+fi
+
+""")
+        
+        if 'mongodb' in db_services:
+            parts.append("""
+# MongoDB detection
+if [ -f "database/init.js" ] || [ -f "database/mongodb/init.js" ]; then
+    print_success "MongoDB initialization script found"
+    DB_INIT_MONGODB=true
+else
+    print_status "No MongoDB initialization script found"
+    DB_INIT_MONGODB=false
+fi
+
+""")
+
+    # Add service startup with health checking
+    parts.append("""
+# Step 5: Service startup and health checking
+print_step "5. Starting services with health monitoring..."
+
+# Pull latest images
+print_status "Pulling Docker images..."
+if ! docker-compose pull; then
+    print_warning "Failed to pull some images, continuing with local images"
+fi
+
+# Start services
+print_status "Starting services..."
+docker-compose up -d
+
+# Wait for services to initialize
+print_status "Waiting for services to initialize..."
+sleep 5
+
+# Health checking with retries
+print_status "Performing health checks..."
+MAX_RETRIES=12
+RETRY_INTERVAL=5
+HEALTHY_SERVICES=0
+TOTAL_SERVICES=0
+
+""")
+    
+    # Generate health checks for each service
+    if services:
+        health_checks = []
+        for service in services:
+            # Service-specific health checks (HTTP probes need the service's port)
+            probe, port_var = _HEALTH_CHECK_DISPATCH.get(service, _GENERIC_HEALTH_CHECK)
+            if port_var is not None and port_var not in variables:
+                probe = ""
+            
+            health_checks.append((_BASH_HEALTH_CHECK_HEAD + probe + _BASH_HEALTH_CHECK_TAIL).format(
+                service=service, user=username, port=variables.get(port_var)))
+        
+        parts.append("".join(health_checks))
+
+    # Add database initialization after services are healthy
+    if 'postgres' in services or 'mongodb' in services:
+        parts.append("""
+# Step 6: Database initialization
+print_step "6. Initializing databases..."
+
+""")
+        
+        if 'postgres' in services or has_common_project:
+            parts.append(_BASH_POSTGRES_INIT.format_map(fields))
         
-        return script_content
+        if 'mongodb' in services or has_common_project:
+            parts.append(_BASH_MONGODB_INIT.format_map(fields))
+
+    # Final status and next steps
+    parts.append(_BASH_SUMMARY)
+    
+    # Add service access information based on template type
+    if template_type == 'common':
+        parts.append(_BASH_COMMON_ACCESS.format_map(fields))
+    else:
+        # Application project access info
+        if 'backend' in services or 'agent-backend' in services:
+            parts.append(_BASH_BACKEND_ACCESS.format_map(fields))
+        
+        if 'frontend' in services or 'agent-frontend' in services:
+            parts.append(_BASH_FRONTEND_ACCESS.format_map(fields))
+        
+        if 'agent-worker' in services:
+            parts.append(_BASH_WORKER_ACCESS.format_map(fields))
+        
+        if has_common_project:
+            parts.append(_BASH_SHARED_ACCESS.format_map(fields))
+
+    # Add final instructions
+    parts.append(_BASH_FINAL.format_map(fields))
+    
+    return "".join(parts)
+
+
+def _fill_skeleton(skeleton: str, values: Dict[str, Any]) -> str:
+    """Substitute student values into a script skeleton in one pass"""
+    return _VAR_RE.sub(lambda match: str(values.get(match.group(1), match.group(0))), skeleton)
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
+class SetupScriptConfig:
+    """Configuration for setup script generation (immutable once created)"""
+    username: str
+    project_name: str
+    template_type: str
+    port_assignment: PortAssignment
+    has_common_project: bool
+    output_dir: str
+    services: List[str]
+    custom_variables: Optional[Dict[str, Any]] = None
+
+
+class SetupScriptManager:
+    """Manages setup script generation from templates"""
+    
+    def __init__(self, templates_dir: str = "templates"):
+        """
+        Initialize setup script manager
+        
+        Args:
+            templates_dir: Directory containing template files
+        """
+        self.templates_dir = templates_dir
+    
+    def create_setup_script(self, config: SetupScriptConfig) -> str:
+        """
+        Create setup script from template with intelligent features
+        
+        Args:
+            config: Setup script generation configuration
+            
+        Returns:
+            Path to generated setup script
+        """
+        setup_content = self.build_setup_content(config)
+        
+        # Write setup script, always left executable as 0755 (on Unix systems)
+        setup_path = os.path.join(config.output_dir, "setup.sh")
+        atomic_write_bytes(setup_path, setup_content.encode('utf-8'), mode=0o755, exact_mode=True)
+        
+        return setup_path
+    
+    def create_setup_scripts_batch(self, configs: List[SetupScriptConfig],
+                                   max_workers: Optional[int] = None) -> List[str]:
+        """
+        Create setup scripts for many students concurrently
+        
+        Script bodies come from the shared skeleton cache; the file writes
+        overlap on a thread pool (os.write releases the GIL).
+        
+        Args:
+            configs: Setup script generation configurations, one per script
+            max_workers: Thread pool size (defaults to min(32, 4 * CPUs, len(configs)))
+            
+        Returns:
+            Paths to generated setup scripts, in the same order as configs
+        """
+        if not configs:
+            return []
+        
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(configs))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.create_setup_script, configs))
+    
+    def build_setup_content(self, config: SetupScriptConfig) -> str:
+        """
+        Generate setup script content without writing it
+        
+        Args:
+            config: Setup script generation configuration
+            
+        Returns:
+            Setup script content (from the template, or the intelligent script)
+        """
+        # Generate template variables
+        variables = self._generate_setup_variables(config)
+        
+        # Get template path or create intelligent script
+        return self._generate_intelligent_setup_script(config, variables)
+    
+    # Former internal entry point, kept for existing callers
+    _generate_setup_script_content = build_setup_content
+    
+    def _generate_setup_variables(self, config: SetupScriptConfig) -> Dict[str, Any]:
+        """Generate template variables for setup script"""
+        # Get port assignments
+        all_ports = config.port_assignment.all_ports
+        
+        # Basic variables
+        basic = {
+            'USERNAME': config.username,
+            'PROJECT_NAME': config.project_name,
+            'TEMPLATE_TYPE': config.template_type,
+            'HAS_COMMON_PROJECT': config.has_common_project,
+            'SERVICES': config.services,
+            'TIMESTAMP': _timestamp(int(time.time())),
+        }
+        
+        # Port assignments (sequential from available ports; zip stops at the shorter)
+        service_ports = dict(zip(_PORT_ORDER, all_ports))
+        
+        # CORS configuration
+        cors_variables = generate_cors_variables(
+            username=config.username,
+            project_name=config.project_name,
+            template_type=config.template_type,
+            port_assignment=config.port_assignment,
+            has_common_project=config.has_common_project,
+            frontend_port=service_ports.get('FRONTEND_PORT'),
+            backend_port=service_ports.get('BACKEND_PORT')
+        )
+        
+        # One construction instead of an update() per source; later sources win
+        return {**basic, **service_ports, **cors_variables, **(config.custom_variables or {})}
+    
+    def _generate_intelligent_setup_script(self, config: SetupScriptConfig, variables: Dict[str, Any]) -> str:
+        """Generate intelligent setup script with advanced features"""
+        
+        # Check if template-specific setup script exists
+        template_path = os.path.join(self.templates_dir, config.template_type, "setup.sh.template")
+        
+        try:
+            # Use existing template and enhance it
+            template_content = read_template_text(template_path, os.stat(template_path).st_mtime)
+        except FileNotFoundError:
+            # Generate intelligent setup script
+            return self._create_intelligent_setup_script(config, variables)
+        
+        # Process template variables
+        processed_content = self._process_template_variables(template_content, variables)
+        return processed_content
+    
+    def _create_intelligent_setup_script(self, config: SetupScriptConfig, variables: Dict[str, Any]) -> str:
+        """Create intelligent setup script with all advanced features"""
+        # The script body depends only on the project shape; build it once per shape
+        port_vars = frozenset(var for var in _PORT_ORDER if var in variables)
+        skeleton = _build_script_skeleton(config.template_type, tuple(config.services or ()),
+                                          config.has_common_project, port_vars)
+        
+        # Then fill in this student's names, ports and timestamp
+        values = {var: variables[var] for var in port_vars}
+        values.update({
+            'USERNAME': config.username,
+            'PROJECT_NAME': config.project_name,
+            'PROJECT_DB_NAME': config.project_name.replace('-', '_'),
+            'TIMESTAMP': variables['TIMESTAMP'],
+        })
+        return _fill_skeleton(skeleton, values)
     
     def _process_template_variables(self, template_content: str, variables: Dict[str, Any]) -> str:
         """Process template variables in setup script"""
@@ -715,81 +870,42 @@ trap - ERR
         # First process conditional blocks
         processed_content = self._process_conditional_blocks(processed_content, variables)
         
-        # Then process regular variables
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            processed_content = processed_content.replace(placeholder, str(value))
+        # Then process regular variables in a single pass (unknown placeholders are left as-is)
+        def replace_variable(match):
+            key = match.group(1)
+            return str(variables[key]) if key in variables else match.group(0)
         
-        return processed_content
+        return _VAR_RE.sub(replace_variable, processed_content)
     
     def _process_conditional_blocks(self, content: str, variables: Dict[str, Any]) -> str:
         """Process conditional blocks in template"""
-        import re
-        
-        # Handle {{#if VARIABLE}} ... {{else}} ... {{/if}} blocks
-        def replace_if_block(match):
-            condition = match.group(1).strip()
-            if_content = match.group(2)
-            else_content = match.group(3) if match.group(3) else ""
-            
-            # Check condition
-            if condition in variables and variables[condition]:
-                return if_content
-            else:
-                return else_content
-        
-        # Pattern for {{#if CONDITION}} content {{else}} content {{/if}}
-        if_pattern = r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{else\}\}(.*?)\{\{/if\}\}'
-        content = re.sub(if_pattern, replace_if_block, content, flags=re.DOTALL)
-        
-        # Pattern for {{#if CONDITION}} content {{/if}} (no else)
-        if_pattern_no_else = r'\{\{#if\s+([^}]+)\}\}(.*?)\{\{/if\}\}'
-        def replace_if_block_no_else(match):
-            condition = match.group(1).strip()
-            if_content = match.group(2)
-            
-            if condition in variables and variables[condition]:
-                return if_content
-            else:
-                return ""
-        
-        content = re.sub(if_pattern_no_else, replace_if_block_no_else, content, flags=re.DOTALL)
-        
-        # Handle {{#unless VARIABLE}} ... {{/unless}} blocks
-        unless_pattern = r'\{\{#unless\s+([^}]+)\}\}(.*?)\{\{/unless\}\}'
-        def replace_unless_block(match):
-            condition = match.group(1).strip()
-            unless_content = match.group(2)
-            
-            # Unless is the opposite of if
-            if condition in variables and not variables[condition]:
-                return unless_content
-            else:
-                return ""
+        if '{{#' not in content:
+            return content
         
-        content = re.sub(unless_pattern, replace_unless_block, content, flags=re.DOTALL)
+        # Handle {{#if VARIABLE}} ... {{else}} ... {{/if}} blocks first, then
+        # {{#if VARIABLE}} ... {{/if}}, then {{#unless VARIABLE}} ... {{/unless}}
+        content = _expand_blocks(_IF_ELSE_RE, content, variables)
+        content = _expand_blocks(_IF_RE, content, variables)
         
-        return content
+        # Unless is the opposite of if
+        return _expand_blocks(_UNLESS_RE, content, variables, negate=True)
     
     def validate_setup_script(self, template_type: str) -> List[str]:
         """Validate setup script template for missing variables or issues"""
         template_path = os.path.join(self.templates_dir, template_type, "setup.sh.template")
         issues = []
         
-        if not os.path.exists(template_path):
+        try:
+            mtime = os.stat(template_path).st_mtime
+        except FileNotFoundError:
             issues.append(f"No setup script template found for {template_type}")
             return issues
         
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_template_text(template_path, mtime)
             
             # Check for common required variables
-            required_vars = [
-                'USERNAME', 'PROJECT_NAME'
-            ]
-            
-            for var in required_vars:
+            for var in _REQUIRED_VARS:
                 if f"{{{{{var}}}}}" not in content:
                     issues.append(f"Missing required variable: {var}")
             
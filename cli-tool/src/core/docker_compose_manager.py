@@ -7,12 +7,67 @@ for multi-student environments with isolated port assignments.
 """
 
 import os
+import re
+from itertools import islice
 import yaml
 import json
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from src.core.template_processor import TemplateProcessor, create_template_context
 from src.core.port_assignment import PortAssignment
+from src.utils.file_utils import atomic_write_bytes
+
+try:
+    # libyaml-backed loader; several times faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+# Services that must define a health check
+_CRITICAL_SERVICE_RE = re.compile(r'postgres|mongodb|redis|backend')
+
+
+@lru_cache(maxsize=8)
+def _parse_compose(compose_content: str) -> Any:
+    """
+    Parse Docker Compose YAML once per content string
+    
+    Validation, port extraction and service info all read the same generated
+    file, so they share one parse. The result is shared: callers must not mutate it.
+    """
+    return yaml.load(compose_content, Loader=_SafeLoader)
+
+
+def _freeze_limits(limits: Dict[str, Dict[str, Any]]) -> Tuple[Tuple[str, Tuple[Tuple[str, Any], ...]], ...]:
+    """Hashable form of a resource limits mapping"""
+    return tuple((category, tuple(values.items())) for category, values in limits.items())
+
+
+@lru_cache(maxsize=32)
+def _flatten_resource_limits(frozen_limits: Tuple) -> Mapping[str, Any]:
+    """
+    Flatten frozen resource limits into template variables
+    
+    {"database": {"memory": "512M"}} becomes {"DATABASE_MEMORY": "512M"}.
+    The result is shared, so it is returned read-only.
+    """
+    return MappingProxyType({
+        f"{category.upper()}_{key.upper()}": value
+        for category, values in frozen_limits
+        for key, value in values
+    })
+
+
+def _resource_variables(limits: Dict[str, Dict[str, Any]]) -> Mapping[str, Any]:
+    """Flatten resource limits, through the cache when every value is hashable"""
+    frozen_limits = _freeze_limits(limits)
+    try:
+        return _flatten_resource_limits(frozen_limits)
+    except TypeError:
+        return _flatten_resource_limits.__wrapped__(frozen_limits)
 
 
 @dataclass
@@ -40,6 +95,9 @@ class DockerComposeManager:
         self.templates_dir = templates_dir
         self.template_processor = TemplateProcessor(templates_dir)
         
+        # Resolved template paths keyed by template type, filled on first use
+        self._template_paths: Dict[str, str] = {}
+        
         # Default resource limits to prevent system overload
         self.default_resource_limits = {
             "database": {
@@ -96,36 +154,37 @@ class DockerComposeManager:
         variables.update(self._generate_resource_variables(config.resource_limits))
         
         # Process template
-        template_path = os.path.join(
-            self.templates_dir, 
-            config.template_type,
-            "docker-compose.yml.template"
-        )
-        
-        if not os.path.exists(template_path):
+        template_path = self._template_paths.get(config.template_type)
+        if template_path is None:
+            template_path = os.path.join(
+                self.templates_dir, 
+                config.template_type,
+                "docker-compose.yml.template"
+            )
+            self._template_paths[config.template_type] = template_path
+        
+        # The processor stats the file once and reuses its compiled form
+        # until the template's mtime changes
+        try:
+            return self.template_processor.process_template_file(template_path, variables)
+        except FileNotFoundError:
             raise FileNotFoundError(f"Docker Compose template not found: {template_path}")
-        
-        return self.template_processor.process_template_file(template_path, variables)
     
-    def _generate_resource_variables(self, custom_limits: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate resource limit variables for templates"""
-        # Merge custom limits with defaults
-        resource_limits = self.default_resource_limits.copy()
-        if custom_limits:
-            for category, limits in custom_limits.items():
-                if category in resource_limits:
-                    resource_limits[category].update(limits)
-                else:
-                    resource_limits[category] = limits
-        
-        # Convert to template variables
-        variables = {}
-        for category, limits in resource_limits.items():
-            for key, value in limits.items():
-                var_name = f"{category.upper()}_{key.upper()}"
-                variables[var_name] = value
-        
-        return variables
+    def _generate_resource_variables(self, custom_limits: Dict[str, Any]) -> Mapping[str, Any]:
+        """
+        Generate resource limit variables for templates
+        
+        The current default_resource_limits are looked up on every call, so
+        later edits to them apply. The result is read-only and may be shared
+        between calls.
+        """
+        default_variables = _resource_variables(self.default_resource_limits)
+        if not custom_limits:
+            return default_variables
+        
+        # Custom limits override defaults key by key, so merging the flattened
+        # forms matches merging the nested dicts
+        return MappingProxyType({**default_variables, **_resource_variables(custom_limits)})
     
     def validate_docker_compose(self, compose_content: str, username: str = None) -> List[str]:
         """
@@ -138,74 +197,74 @@ class DockerComposeManager:
         Returns:
             List of validation warnings/errors
         """
-        warnings = []
-        
+        return list(self._iter_validation_warnings(compose_content, username))
+    
+    def _iter_validation_warnings(self, compose_content: str, username: str = None) -> Iterator[str]:
+        """Yield validation warnings lazily so callers can stop early"""
         try:
             # Parse YAML
-            compose_data = yaml.safe_load(compose_content)
-            
+            compose_data = _parse_compose(compose_content)
+        except yaml.YAMLError as e:
+            yield f"YAML parsing error: {e}"
+            return
+        
+        yield from self._iter_compose_data_warnings(compose_data, username)
+    
+    def _iter_compose_data_warnings(self, compose_data: Any, username: str = None) -> Iterator[str]:
+        """Validate parsed Docker Compose data"""
+        try:
             # Validate structure
             if not isinstance(compose_data, dict):
-                warnings.append("Invalid Docker Compose format: not a dictionary")
-                return warnings
+                yield "Invalid Docker Compose format: not a dictionary"
+                return
             
             # Check required sections
             if 'services' not in compose_data:
-                warnings.append("Missing 'services' section")
+                yield "Missing 'services' section"
             
             if 'networks' not in compose_data:
-                warnings.append("Missing 'networks' section")
+                yield "Missing 'networks' section"
             
             # Validate services
             if 'services' in compose_data:
-                services_warnings = self._validate_services(compose_data['services'], username)
-                warnings.extend(services_warnings)
+                yield from self._iter_service_warnings(compose_data['services'], username)
             
             # Validate networks
             if 'networks' in compose_data:
-                network_warnings = self._validate_networks(compose_data['networks'])
-                warnings.extend(network_warnings)
+                yield from self._validate_networks(compose_data['networks'])
             
-        except yaml.YAMLError as e:
-            warnings.append(f"YAML parsing error: {e}")
         except Exception as e:
-            warnings.append(f"Validation error: {e}")
-        
-        return warnings
+            yield f"Validation error: {e}"
     
-    def _validate_services(self, services: Dict[str, Any], username: str = None) -> List[str]:
+    def _iter_service_warnings(self, services: Dict[str, Any], username: str = None) -> Iterator[str]:
         """Validate Docker Compose services"""
-        warnings = []
-        
         for service_name, service_config in services.items():
             if not isinstance(service_config, dict):
-                warnings.append(f"Service '{service_name}': invalid configuration")
+                yield f"Service '{service_name}': invalid configuration"
                 continue
             
             # Check container naming
             if 'container_name' not in service_config:
-                warnings.append(f"Service '{service_name}': missing container_name")
+                yield f"Service '{service_name}': missing container_name"
             # Note: Skip container name prefix validation as it's checked during template processing
             
             # Check resource limits
-            if 'deploy' in service_config and 'resources' in service_config['deploy']:
-                resources = service_config['deploy']['resources']
+            deploy = service_config.get('deploy', {})
+            if 'resources' in deploy:
+                resources = deploy['resources']
                 if 'limits' not in resources:
-                    warnings.append(f"Service '{service_name}': missing resource limits")
+                    yield f"Service '{service_name}': missing resource limits"
             else:
-                warnings.append(f"Service '{service_name}': missing resource configuration")
+                yield f"Service '{service_name}': missing resource configuration"
             
             # Check health checks for critical services
-            critical_services = ['postgres', 'mongodb', 'redis', 'backend']
-            if any(keyword in service_name.lower() for keyword in critical_services):
+            if _CRITICAL_SERVICE_RE.search(service_name.lower()):
                 if 'healthcheck' not in service_config:
-                    warnings.append(f"Service '{service_name}': missing health check")
+                    yield f"Service '{service_name}': missing health check"
             
             # Check network configuration
             if 'networks' not in service_config:
-                warnings.append(f"Service '{service_name}': missing network configuration")
-        
-        return warnings
+                yield f"Service '{service_name}': missing network configuration"
     
     def _validate_networks(self, networks: Dict[str, Any]) -> List[str]:
         """Validate Docker Compose networks"""
@@ -231,26 +290,39 @@ class DockerComposeManager:
         Returns:
             List of (host_port, container_port, service_name) tuples
         """
+        # Without a ports key there is nothing to extract; skip the parse
+        if 'ports' not in compose_content:
+            return []
+        
+        try:
+            compose_data = _parse_compose(compose_content)
+        except yaml.YAMLError:
+            # Return empty list if parsing fails
+            return []
+        
+        return self._extract_port_mappings_data(compose_data)
+    
+    def _extract_port_mappings_data(self, compose_data: Any) -> List[Tuple[int, int, str]]:
+        """Extract port mappings from parsed Docker Compose data"""
         port_mappings = []
+        append = port_mappings.append
         
         try:
-            compose_data = yaml.safe_load(compose_content)
-            
             if 'services' in compose_data:
                 for service_name, service_config in compose_data['services'].items():
                     if 'ports' in service_config:
                         for port_mapping in service_config['ports']:
                             if isinstance(port_mapping, str):
                                 # Parse "host:container" format
-                                if ':' in port_mapping:
-                                    host_part, container_part = port_mapping.split(':', 1)
+                                host_part, separator, container_part = port_mapping.partition(':')
+                                if separator:
                                     # Remove quotes and extract port numbers
                                     host_port = int(host_part.strip('\"'))
                                     container_port = int(container_part.strip('\"'))
-                                    port_mappings.append((host_port, container_port, service_name))
+                                    append((host_port, container_port, service_name))
             
-        except (yaml.YAMLError, ValueError, KeyError) as e:
-            # Return empty list if parsing fails
+        except (ValueError, KeyError):
+            # Return what was collected if a mapping is malformed
             pass
         
         return port_mappings
@@ -268,23 +340,27 @@ class DockerComposeManager:
         """
         warnings = []
         port_mappings = self.extract_port_mappings(compose_content)
-        allocated_ports = set(port_assignment.all_ports)
+        
+        # Range membership is constant time; no need to materialize every allocated port
+        segment1_range = port_assignment.segment1_range
+        segment2_range = port_assignment.segment2_range or range(0)
         
         used_ports = set()
+        add_used_port = used_ports.add
         for host_port, container_port, service_name in port_mappings:
             # Check if port is in allocated range
-            if host_port not in allocated_ports:
+            if host_port not in segment1_range and host_port not in segment2_range:
                 warnings.append(
                     f"Service '{service_name}': port {host_port} not in allocated range"
                 )
             
-            # Check for duplicate port usage
-            if host_port in used_ports:
+            # Check for duplicate port usage: add() leaves the size unchanged for a repeat
+            used_count = len(used_ports)
+            add_used_port(host_port)
+            if len(used_ports) == used_count:
                 warnings.append(
                     f"Service '{service_name}': port {host_port} already used by another service"
                 )
-            else:
-                used_ports.add(host_port)
         
         return warnings
     
@@ -354,14 +430,16 @@ class DockerComposeManager:
         # Generate content
         compose_content = self.generate_docker_compose(config)
         
-        # Validate content
-        warnings = self.validate_docker_compose(compose_content)
-        if warnings:
+        # Validate content: only the first 5 warnings are kept, the rest are counted
+        warnings = self._iter_validation_warnings(compose_content)
+        shown = list(islice(warnings, 5))
+        if shown:
             print("⚠️  Docker Compose validation warnings:")
-            for warning in warnings[:5]:  # Show first 5 warnings
+            for warning in shown:
                 print(f"  - {warning}")
-            if len(warnings) > 5:
-                print(f"  ... and {len(warnings) - 5} more warnings")
+            remaining = sum(1 for _ in warnings)
+            if remaining:
+                print(f"  ... and {remaining} more warnings")
         
         # Check port conflicts
         port_warnings = self.check_port_conflicts(compose_content, config.port_assignment)
@@ -370,12 +448,10 @@ class DockerComposeManager:
             for warning in port_warnings:
                 print(f"  - {warning}")
         
-        # Write file
+        # Write file atomically, encoded once
         output_path = os.path.join(config.output_dir, "docker-compose.yml")
         os.makedirs(config.output_dir, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(compose_content)
+        atomic_write_bytes(output_path, compose_content.encode('utf-8'))
         
         return output_path
     
@@ -398,7 +474,7 @@ class DockerComposeManager:
         }
         
         try:
-            compose_data = yaml.safe_load(compose_content)
+            compose_data = _parse_compose(compose_content)
             
             # Extract services
             if 'services' in compose_data:
@@ -420,7 +496,7 @@ class DockerComposeManager:
                 service_info["volumes"] = list(compose_data['volumes'].keys())
             
             # Extract port mappings
-            service_info["port_mappings"] = self.extract_port_mappings(compose_content)
+            service_info["port_mappings"] = self._extract_port_mappings_data(compose_data)
             
         except yaml.YAMLError:
             pass
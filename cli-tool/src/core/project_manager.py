@@ -405,7 +405,7 @@ For more information, check the project documentation or contact your instructor
             )
             
             # Generate setup script content using the setup script manager
-            return self.setup_script_manager._generate_setup_script_content(setup_config)
+            return self.setup_script_manager.build_setup_content(setup_config)
             
         except Exception as e:
             print(f"⚠️  Warning: Failed to generate setup script with setup script manager: {e}")
@@ -525,7 +525,7 @@ echo "📖 For more information, see README.md"
             except Exception:
                 pass  # Ignore errors in port extraction
         
-        return sorted(list(set(ports_used)))
+        return sorted(set(ports_used))
     
     def _save_project_config(self, project_path: str, config: ProjectConfig):
         """Save project configuration to file"""
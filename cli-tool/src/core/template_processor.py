@@ -8,10 +8,16 @@ and interdependency warnings for Docker Compose projects.
 import os
 import re
 import yaml
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, FrozenSet, List, NamedTuple, Optional, Union
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from src.core.port_assignment import PortAssignment
 from src.config.cors_config_manager import generate_cors_variables
+from src.utils.file_utils import read_template_text
+
+
+_VARIABLE_RE = re.compile(r'\{\{([^}]+)\}\}')
+_CONDITIONAL_RE = re.compile(r'\{\{#(if_[^}]+)\}\}(.*?)\{\{/\1\}\}', re.DOTALL)
 
 
 @dataclass
@@ -26,6 +32,16 @@ class TemplateContext:
     template_variables: Dict[str, Any]
 
 
+class TemplateFile(NamedTuple):
+    """One version of a template file and everything derived from it"""
+    mtime: int
+    text: str
+    render: Callable[[Dict[str, Any]], str]
+    referenced: FrozenSet[str]
+    # On-disk bytes when the template renders to exactly them, else None
+    static_bytes: Optional[bytes]
+
+
 class TemplateProcessor:
     """Processes template files with variable substitution and conditional logic"""
     
@@ -37,8 +53,8 @@ class TemplateProcessor:
             templates_dir: Directory containing template files
         """
         self.templates_dir = templates_dir
-        self.variable_pattern = re.compile(r'\{\{([^}]+)\}\}')
-        self.conditional_pattern = re.compile(r'\{\{#(if_[^}]+)\}\}(.*?)\{\{/\1\}\}', re.DOTALL)
+        self.variable_pattern = _VARIABLE_RE
+        self.conditional_pattern = _CONDITIONAL_RE
         self.else_pattern = re.compile(r'\{\{else\}\}')
     
     def generate_template_variables(self, context: TemplateContext) -> Dict[str, Any]:
@@ -111,11 +127,9 @@ class TemplateProcessor:
             'SEGMENT2_END': context.port_assignment.segment2_end,
             'HAS_TWO_SEGMENTS': context.port_assignment.has_two_segments,
             **port_assignments,
-            **cors_variables
-        }
-        
-        # Add conditional flags
-        variables.update({
+            **cors_variables,
+            
+            # Conditional flags
             'if_common_project': context.has_common_project,
             'if_no_common_project': not context.has_common_project,
             'if_self_contained': not context.has_common_project,
@@ -123,7 +137,7 @@ class TemplateProcessor:
             'if_rag_template': context.template_type == 'rag',
             'if_agent_template': context.template_type == 'agent',
             'if_common_template': context.template_type == 'common'
-        })
+        }
         
         return variables
     
@@ -139,76 +153,61 @@ class TemplateProcessor:
         Returns:
             Processed template content
         """
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"Template file not found: {template_path}")
+        # Conditional blocks are expanded before variable substitution
+        return self.load_template_file(template_path).render(variables)
+    
+    def load_template_file(self, template_path: str) -> TemplateFile:
+        """
+        Load a template file with a single stat
         
-        with open(template_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        The compiled renderer, referenced variable names and static bytes are
+        derived once per file version (path and mtime) and shared.
         
-        # Process conditional blocks first (they handle their own variable substitution)
-        content = self._process_conditionals(content, variables)
+        Args:
+            template_path: Path to template file
+            
+        Returns:
+            TemplateFile for the current version of the file
+        """
+        try:
+            mtime = os.stat(template_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template file not found: {template_path}")
         
-        # Process any remaining variable substitutions
-        content = self._process_variables(content, variables)
+        return _load_template_file(template_path, mtime)
+    
+    def get_referenced_variables(self, template_path: str) -> FrozenSet[str]:
+        """
+        Get the top-level variable names a template file refers to
         
-        return content
+        Args:
+            template_path: Path to template file
+            
+        Returns:
+            Frozen set of variable and condition names ({{PORT.BACKEND}} yields PORT)
+        """
+        return self.load_template_file(template_path).referenced
+    
+    def is_static_template(self, template_path: str) -> bool:
+        """
+        Check whether a template file renders to exactly its own bytes
+        
+        Args:
+            template_path: Path to template file
+            
+        Returns:
+            True if the template has no placeholders and needs no newline translation,
+            so its output can be produced by copying the file
+        """
+        return self.load_template_file(template_path).static_bytes is not None
     
     def _process_conditionals(self, content: str, variables: Dict[str, Any]) -> str:
         """Process conditional blocks in template content"""
-        def replace_conditional(match):
-            condition = match.group(1)
-            block_content = match.group(2)
-            
-            # Check if condition is true - handle boolean conversion
-            condition_value = variables.get(condition, False)
-            if isinstance(condition_value, str):
-                condition_value = condition_value.lower() in ('true', '1', 'yes')
-            
-            # Handle else blocks
-            if '{{else}}' in block_content:
-                if_part, else_part = block_content.split('{{else}}', 1)
-                selected_content = if_part.strip() if condition_value else else_part.strip()
-            else:
-                selected_content = block_content.strip() if condition_value else ''
-            
-            return selected_content
-        
-        # Process all conditional blocks iteratively
-        processed_content = content
-        max_iterations = 10  # Prevent infinite loops
-        iteration = 0
-        
-        while self.conditional_pattern.search(processed_content) and iteration < max_iterations:
-            processed_content = self.conditional_pattern.sub(replace_conditional, processed_content)
-            iteration += 1
-        
-        return processed_content
+        return _expand_conditionals(content, variables)
     
     def _process_variables(self, content: str, variables: Dict[str, Any]) -> str:
         """Process variable substitutions in template content"""
-        def replace_variable(match):
-            var_name = match.group(1).strip()
-            
-            # Handle nested variable access (e.g., {{PORT.BACKEND}})
-            if '.' in var_name:
-                parts = var_name.split('.')
-                value = variables
-                for part in parts:
-                    if isinstance(value, dict) and part in value:
-                        value = value[part]
-                    else:
-                        return match.group(0)  # Return original if not found
-                return str(value) if value is not None else ''
-            
-            # Simple variable substitution
-            value = variables.get(var_name)
-            if value is not None:
-                return str(value)
-            else:
-                # Return original placeholder if variable not found
-                return match.group(0)
-        
-        return self.variable_pattern.sub(replace_variable, content)
+        return _substitute_variables(content, variables)
     
     def validate_template(self, template_path: str, variables: Dict[str, Any]) -> List[str]:
         """
@@ -427,7 +426,130 @@ Always test the complete project after template modifications!
         all_placeholders.update(var_ref.strip() for var_ref in variable_refs)
         all_placeholders.update(conditional_refs)
         
-        return sorted(list(all_placeholders))
+        return sorted(all_placeholders)
+
+
+def _expand_conditionals(content: str, variables: Dict[str, Any]) -> str:
+    """Expand {{#if_x}}...{{else}}...{{/if_x}} blocks against the variables"""
+    def replace_conditional(match):
+        condition = match.group(1)
+        block_content = match.group(2)
+        
+        # Check if condition is true - handle boolean conversion
+        condition_value = variables.get(condition, False)
+        if isinstance(condition_value, str):
+            condition_value = condition_value.lower() in ('true', '1', 'yes')
+        
+        # Handle else blocks
+        if '{{else}}' in block_content:
+            if_part, else_part = block_content.split('{{else}}', 1)
+            selected_content = if_part.strip() if condition_value else else_part.strip()
+        else:
+            selected_content = block_content.strip() if condition_value else ''
+        
+        return selected_content
+    
+    # Process all conditional blocks iteratively
+    processed_content = content
+    max_iterations = 10  # Prevent infinite loops
+    iteration = 0
+    
+    while _CONDITIONAL_RE.search(processed_content) and iteration < max_iterations:
+        processed_content = _CONDITIONAL_RE.sub(replace_conditional, processed_content)
+        iteration += 1
+    
+    return processed_content
+
+
+def _resolve_variable(reference: str, placeholder: str, variables: Dict[str, Any]) -> str:
+    """Resolve one {{...}} reference, returning the placeholder if it is unknown"""
+    var_name = reference.strip()
+    
+    # Handle nested variable access (e.g., {{PORT.BACKEND}})
+    if '.' in var_name:
+        value = variables
+        for part in var_name.split('.'):
+            if isinstance(value, dict) and part in value:
+                value = value[part]
+            else:
+                return placeholder  # Return original if not found
+        return str(value) if value is not None else ''
+    
+    # Simple variable substitution
+    value = variables.get(var_name)
+    if value is not None:
+        return str(value)
+    
+    # Return original placeholder if variable not found
+    return placeholder
+
+
+def _substitute_variables(content: str, variables: Dict[str, Any]) -> str:
+    """Replace every {{...}} reference in content"""
+    return _VARIABLE_RE.sub(lambda match: _resolve_variable(match.group(1), match.group(0), variables), content)
+
+
+def _render_template(content: str, variables: Dict[str, Any]) -> str:
+    """Render template text with conditionals, then variable substitution"""
+    return _substitute_variables(_expand_conditionals(content, variables), variables)
+
+
+def _compile_template(content: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compile template text into a render callable
+    
+    Templates without conditional blocks are split once into literal text and
+    variable slots. Each render resolves every distinct reference once, fills
+    the slots and joins, with no regex scan. Templates with conditionals keep
+    the full expand-then-substitute pipeline.
+    """
+    if _CONDITIONAL_RE.search(content):
+        return partial(_render_template, content)
+    
+    parts = _VARIABLE_RE.split(content)
+    if len(parts) == 1:
+        # Static template: every render is the cached text itself
+        return lambda variables: content
+    
+    # Distinct references in first-seen order, and (slot index in parts, reference index)
+    references = tuple(dict.fromkeys(parts[1::2]))
+    placeholders = tuple('{{%s}}' % reference for reference in references)
+    reference_index = {reference: index for index, reference in enumerate(references)}
+    slots = tuple((i, reference_index[parts[i]]) for i in range(1, len(parts), 2))
+    
+    def render(variables: Dict[str, Any]) -> str:
+        values = [
+            _resolve_variable(reference, placeholder, variables)
+            for reference, placeholder in zip(references, placeholders)
+        ]
+        chunks = parts.copy()
+        for position, index in slots:
+            chunks[position] = values[index]
+        return ''.join(chunks)
+    
+    return render
+
+
+@lru_cache(maxsize=64)
+def _load_template_file(path: str, mtime: int) -> TemplateFile:
+    """Compile and scan one template file version"""
+    text = read_template_text(path, mtime)
+    
+    # Top-level variable and condition names the template refers to
+    referenced = frozenset(
+        reference.strip().lstrip('#/').split('.', 1)[0]
+        for reference in _VARIABLE_RE.findall(text)
+    )
+    
+    static_bytes = None
+    if not referenced:
+        # Text-mode reads translate \r\n, so only LF-only files match byte for byte
+        with open(path, 'rb') as f:
+            data = f.read()
+        if b'\r' not in data:
+            static_bytes = data
+    
+    return TemplateFile(mtime, text, _compile_template(text), referenced, static_bytes)
 
 
 def create_template_context(username: str, project_name: str, template_type: str, 
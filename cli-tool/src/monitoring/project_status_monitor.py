@@ -507,7 +507,7 @@ class PortUsageAnalyzer:
         usage_percentage = (total_used / total_assigned * 100) if total_assigned > 0 else 0
         
         # Get unused ports
-        unused_ports = sorted(list(assigned_ports - used_ports))
+        unused_ports = sorted(assigned_ports - used_ports)
         
         # Format port ranges
         port_ranges = []
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+File Helpers
+
+Shared by the README, setup script, database and Docker Compose generators
+so every template is read, and every generated file written, the same way.
+"""
+
+import os
+from functools import lru_cache
+
+# Write-once output; bulk runs can tell the kernel not to keep it cached
+_FADV_DONTNEED = getattr(os, 'POSIX_FADV_DONTNEED', None)
+
+
+def atomic_write_bytes(path: str, data: bytes, mode: int = 0o666,
+                       exact_mode: bool = False, drop_page_cache: bool = False):
+    """
+    Write data to a file atomically
+    
+    The bytes go to a temporary file in the same directory, which then
+    replaces path, so a crash never leaves a partial file behind. The
+    temporary file is created with mode and the kernel applies the process
+    umask, as a plain open() would. A file being replaced keeps its current
+    permissions.
+    
+    Args:
+        path: Destination file path
+        data: Encoded file content
+        mode: Permission bits for a newly created file, before the umask
+        exact_mode: Always end with exactly mode, ignoring umask and existing permissions
+        drop_page_cache: Ask the kernel to drop the written pages from its cache
+    """
+    directory, name = os.path.split(path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    while True:
+        temp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            fd = os.open(temp_path, flags, mode)
+            break
+        except FileExistsError:
+            continue
+    
+    try:
+        try:
+            if exact_mode:
+                final_mode = mode
+            else:
+                try:
+                    final_mode = os.stat(path).st_mode & 0o7777
+                except FileNotFoundError:
+                    final_mode = None
+            
+            if final_mode is not None:
+                try:
+                    os.fchmod(fd, final_mode)
+                except (OSError, AttributeError):
+                    pass  # Windows or permission issues
+            
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            
+            if drop_page_cache and _FADV_DONTNEED is not None:
+                # DONTNEED starts writeback and drops whatever pages are clean
+                os.posix_fadvise(fd, 0, 0, _FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+@lru_cache(maxsize=64)
+def read_template_text(path: str, mtime: float) -> str:
+    """
+    Read a template file once per version
+    
+    Callers pass the file's current mtime, so an edited template is read
+    again. The file is read with a single read() and decoded as UTF-8 with
+    universal newlines, as text-mode open() would.
+    
+    Args:
+        path: Template file path
+        mtime: Modification time from the caller's stat of path
+        
+    Returns:
+        Template text
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        os.close(fd)
+    
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
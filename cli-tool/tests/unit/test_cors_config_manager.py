@@ -5,6 +5,7 @@ Tests CORS origin generation, container hostname generation,
 and different rendering scenarios (CSR/SSR).
 """
 
+import dataclasses
 import unittest
 from src.config.cors_config_manager import (
     CorsConfigManager, 
@@ -464,6 +465,48 @@ class TestCorsConfigManager(unittest.TestCase):
         self.assertNotIn('postgres_shared', standalone_hostnames)
         self.assertNotIn('redis_shared', standalone_hostnames)
 
+    
+    def test_cached_results_are_independent(self):
+        """Test that memoized CORS results are not shared between calls"""
+        config = create_cors_config(
+            username="testuser",
+            project_name="test-rag",
+            template_type="rag",
+            port_assignment=self.port_assignment,
+            has_common_project=True
+        )
+        
+        first = self.manager.generate_cors_config(config)
+        first['CORS_ORIGINS_CSR_LIST'].append("http://mutated:1")
+        first['CONTAINER_HOSTNAMES']['mutated'] = "http://mutated:1"
+        
+        second = self.manager.generate_cors_config(config)
+        self.assertNotIn("http://mutated:1", second['CORS_ORIGINS_CSR_LIST'])
+        self.assertNotIn('mutated', second['CONTAINER_HOSTNAMES'])
+        self.assertEqual(second['CORS_ORIGINS_CSR_LIST'], self.manager._generate_csr_origins(config))
+
+    
+    def test_cors_config_is_immutable(self):
+        """Test that CorsConfig is frozen and stores sequences as tuples"""
+        config = CorsConfig(
+            username="testuser",
+            project_name="test-rag",
+            template_type="rag",
+            port_assignment=self.port_assignment,
+            has_common_project=True,
+            frontend_port=8008,
+            backend_port=8007,
+            additional_ports=[8001, 8002],
+            custom_origins=["https://example.com"]
+        )
+        
+        self.assertEqual(config.additional_ports, (8001, 8002))
+        self.assertEqual(config.custom_origins, ("https://example.com",))
+        self.assertEqual(config.all_ports_set, frozenset(self.port_assignment.all_ports))
+        
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.frontend_port = 8000
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
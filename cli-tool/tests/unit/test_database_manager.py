@@ -12,6 +12,17 @@ from src.core.database_manager import (
 )
 from src.core.port_assignment import PortAssignment
 
+# Shipped templates live at the repository root, next to cli-tool/
+TEMPLATES_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'templates'))
+
+
+def _require_database_templates(*template_types):
+    """Skip the calling test, visibly, when the shipped database templates are absent"""
+    for template_type in template_types:
+        if not os.path.isdir(os.path.join(TEMPLATES_DIR, template_type, "database")):
+            import pytest
+            pytest.skip(f"Database templates not found under {TEMPLATES_DIR}")
+
 
 def test_database_template_generation():
     """Test database template generation"""
@@ -473,6 +484,159 @@ def test_convenience_functions():
     return True
 
 
+def test_batch_timestamp():
+    """Test that scripts generated in one batch share a timestamp"""
+    print("\n🧪 Testing Batch Timestamp")
+    print("=" * 30)
+    
+    emma_assignment = PortAssignment(
+        login_id="Emma",
+        segment1_start=4000,
+        segment1_end=4100,
+        segment2_start=8000,
+        segment2_end=8100
+    )
+    
+    manager = DatabaseManager("templates")
+    configs = [
+        create_database_config(
+            username=username,
+            project_name="common",
+            template_type="common",
+            port_assignment=emma_assignment,
+            database_type="postgresql",
+            output_dir="test_output"
+        )
+        for username in ("Emma", "Bob")
+    ]
+    
+    timestamp = "2024-01-15T10:30:00"
+    stamps = {
+        manager._generate_database_variables(config, timestamp=timestamp)['CURRENT_TIMESTAMP']
+        for config in configs
+    }
+    
+    assert stamps == {timestamp}
+    assert manager._generate_database_variables(configs[0])['CURRENT_TIMESTAMP'] != timestamp
+    
+    print("✅ Batch scripts share one timestamp")
+    return True
+
+
+def test_validation_cache_bounded():
+    """Test that validation results are reused per template version and bounded"""
+    print("\n🧪 Testing Validation Cache")
+    print("=" * 30)
+    
+    emma_assignment = PortAssignment(
+        login_id="Emma",
+        segment1_start=4000,
+        segment1_end=4100
+    )
+    
+    manager = DatabaseManager("templates")
+    config = create_database_config(
+        username="Emma",
+        project_name="rag",
+        template_type="rag",
+        port_assignment=emma_assignment,
+        database_type="postgresql",
+        output_dir="test_output"
+    )
+    
+    first = manager._validate_generated_script(config, "SELECT 1;", 1)
+    assert manager._validate_generated_script(config, "CREATE EXTENSION vector;", 1) == first
+    
+    # Every template edit adds a version; old versions are evicted
+    for mtime in range(2, 40):
+        manager._validate_generated_script(config, "SELECT 1;", mtime)
+    assert len(manager._validation_cache) == 16
+    
+    print("✅ Validation cache reused and bounded")
+    return True
+
+
+def test_bulk_generate():
+    """Test that bulk generation matches per-student generation"""
+    print("\n🧪 Testing Bulk Generation")
+    print("=" * 30)
+    
+    _require_database_templates("common", "rag")
+    
+    manager = DatabaseManager(TEMPLATES_DIR)
+    configs = []
+    for index, username in enumerate(("Emma", "Bob", "Chen")):
+        assignment = PortAssignment(
+            login_id=username,
+            segment1_start=4000 + index * 100,
+            segment1_end=4099 + index * 100,
+            segment2_start=None,
+            segment2_end=None
+        )
+        for template_type, database_type in (("common", "postgresql"), ("common", "mongodb"), ("rag", "postgresql")):
+            configs.append(create_database_config(
+                username=username,
+                project_name=f"{template_type}-{username.lower()}",
+                template_type=template_type,
+                port_assignment=assignment,
+                database_type=database_type,
+                output_dir="test_output"
+            ))
+    
+    timestamp = "2024-01-15T10:30:00"
+    expected = [manager.generate_database_init_script(config, timestamp) for config in configs]
+    scripts = manager.bulk_generate(configs, timestamp)
+    
+    assert scripts == expected
+    assert "Chen_user" in scripts[-1]
+    
+    print(f"✅ Bulk generation matches {len(scripts)} individual scripts")
+    return True
+
+
+def test_bulk_create():
+    """Test parallel database file creation for several students"""
+    print("\n🧪 Testing Bulk Create")
+    print("=" * 25)
+    
+    _require_database_templates("rag")
+    
+    manager = DatabaseManager(TEMPLATES_DIR)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        configs = []
+        for index, username in enumerate(("Emma", "Bob", "Chen")):
+            assignment = PortAssignment(
+                login_id=username,
+                segment1_start=4000 + index * 100,
+                segment1_end=4099 + index * 100,
+                segment2_start=None,
+                segment2_end=None
+            )
+            configs.append(create_database_config(
+                username=username,
+                project_name="rag-chatbot",
+                template_type="rag",
+                port_assignment=assignment,
+                database_type="all",
+                output_dir=os.path.join(temp_dir, username)
+            ))
+        
+        results = manager.bulk_create(configs, processes=2)
+        
+        assert len(results) == len(configs)
+        for config, created_files in zip(configs, results):
+            assert len(created_files) == 1
+            for file_path, content in created_files.items():
+                assert file_path.startswith(config.output_dir)
+                assert f"{config.username}_user" in content
+                with open(file_path, encoding='utf-8') as f:
+                    assert f.read() == content
+    
+    print(f"✅ Bulk create wrote files for {len(results)} students")
+    return True
+
+
 if __name__ == '__main__':
     # Change to project root directory (parent of cli-tool)
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -487,6 +651,10 @@ if __name__ == '__main__':
     success &= test_supported_databases()
     success &= test_database_connection_info()
     success &= test_convenience_functions()
+    success &= test_batch_timestamp()
+    success &= test_validation_cache_bounded()
+    success &= test_bulk_generate()
+    success &= test_bulk_create()
     
     if success:
         print("\n🎉 All database initialization template system tests passed!")
@@ -349,6 +349,55 @@ volumes:
     return True
 
 
+def test_resource_variables():
+    """Test resource limit variable generation"""
+    print("\n🧪 Testing Resource Limit Variables")
+    print("=" * 35)
+    
+    manager = DockerComposeManager("templates")
+    
+    # Test 1: Defaults only
+    variables = manager._generate_resource_variables({})
+    assert variables["DATABASE_MEMORY"] == "512M"
+    assert variables["CACHE_CPUS"] == "0.25"
+    print("✅ Default resource variables generated")
+    
+    # Test 2: Custom limits override and extend defaults
+    variables = manager._generate_resource_variables({
+        "database": {"memory": "1G"},
+        "gpu": {"count": 1}
+    })
+    assert variables["DATABASE_MEMORY"] == "1G"
+    assert variables["DATABASE_CPUS"] == "0.5"
+    assert variables["GPU_COUNT"] == 1
+    print("✅ Custom resource limits merged")
+    
+    # Test 3: Custom limits do not leak into later calls
+    variables = manager._generate_resource_variables(None)
+    assert variables["DATABASE_MEMORY"] == "512M"
+    assert "GPU_COUNT" not in variables
+    assert manager.default_resource_limits["database"]["memory"] == "512M"
+    print("✅ Default resource limits left unchanged")
+    
+    # Test 4: Default variables are computed once and shared
+    assert manager._generate_resource_variables({}) is manager._generate_resource_variables(None)
+    print("✅ Default resource variables reused across calls")
+    
+    # Test 5: Shared results are read-only and later default edits apply
+    try:
+        variables["DATABASE_MEMORY"] = "2G"
+        assert False, "shared resource variables must be read-only"
+    except TypeError:
+        pass
+    manager.default_resource_limits["database"]["memory"] = "2G"
+    assert manager._generate_resource_variables(None)["DATABASE_MEMORY"] == "2G"
+    assert DockerComposeManager("templates")._generate_resource_variables(None)["DATABASE_MEMORY"] == "512M"
+    print("✅ Default resource limits read on every call")
+    
+    print("\n🎉 All resource limit variable tests passed!")
+    return True
+
+
 def test_convenience_functions():
     """Test convenience functions"""
     print("\n🧪 Testing Convenience Functions")
@@ -441,6 +490,7 @@ if __name__ == '__main__':
     success &= test_docker_compose_validation()
     success &= test_port_conflict_detection()
     success &= test_service_info_extraction()
+    success &= test_resource_variables()
     success &= test_convenience_functions()
     
     if success:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for shared file writing helpers
+"""
+
+import os
+import stat
+import sys
+import tempfile
+from src.utils.file_utils import atomic_write_bytes, read_template_text
+
+
+def test_atomic_write_new_file():
+    """Test that a new file gets the umask-adjusted mode and no temp file is left"""
+    print("🧪 Testing Atomic Write of a New File")
+    print("=" * 40)
+    
+    umask = os.umask(0o022)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "out.txt")
+            atomic_write_bytes(path, b"hello\n")
+            
+            with open(path, 'rb') as f:
+                assert f.read() == b"hello\n"
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+            assert os.listdir(temp_dir) == ["out.txt"]
+    finally:
+        os.umask(umask)
+    
+    print("✅ New file written with umask-adjusted permissions")
+
+
+def test_atomic_write_keeps_existing_mode():
+    """Test that replacing a file keeps the permissions the user gave it"""
+    print("\n🧪 Testing Atomic Write Over an Existing File")
+    print("=" * 40)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "docker-compose.yml")
+        atomic_write_bytes(path, b"old")
+        os.chmod(path, 0o600)
+        
+        atomic_write_bytes(path, b"new")
+        
+        with open(path, 'rb') as f:
+            assert f.read() == b"new"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    
+    print("✅ Existing permissions kept")
+
+
+def test_atomic_write_exact_mode():
+    """Test that exact_mode gives the same mode for new and replaced files"""
+    print("\n🧪 Testing Atomic Write With an Exact Mode")
+    print("=" * 40)
+    
+    umask = os.umask(0o077)
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "setup.sh")
+            atomic_write_bytes(path, b"#!/bin/bash\n", mode=0o755, exact_mode=True)
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+            
+            os.chmod(path, 0o600)
+            atomic_write_bytes(path, b"#!/bin/bash\n", mode=0o755, exact_mode=True)
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+    finally:
+        os.umask(umask)
+    
+    print("✅ Exact mode applied to new and replaced files")
+
+
+def test_read_template_text():
+    """Test that templates are read with universal newlines and re-read once edited"""
+    print("\n🧪 Testing Template Reading")
+    print("=" * 40)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "setup.sh.template")
+        with open(path, 'wb') as f:
+            f.write(b"#!/bin/bash\r\necho {{USERNAME}}\r")
+        mtime = os.stat(path).st_mtime
+        
+        assert read_template_text(path, mtime) == "#!/bin/bash\necho {{USERNAME}}\n"
+        
+        with open(path, 'wb') as f:
+            f.write(b"edited")
+        assert read_template_text(path, mtime) == "#!/bin/bash\necho {{USERNAME}}\n"
+        assert read_template_text(path, mtime + 1) == "edited"
+    
+    print("✅ Template text read once per version")
+
+
+if __name__ == '__main__':
+    success = True
+    
+    # Run tests
+    for test in (test_atomic_write_new_file, test_atomic_write_keeps_existing_mode,
+                 test_atomic_write_exact_mode, test_read_template_text):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            success = False
+    
+    sys.exit(0 if success else 1)
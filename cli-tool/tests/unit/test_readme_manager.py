@@ -408,6 +408,131 @@ def test_convenience_function():
     return True
 
 
+def test_conditional_blocks_mixed_order():
+    """Test an if-without-else block followed by an if/else block"""
+    manager = ReadmeManager(templates_dir="templates")
+    
+    content = "{{#if A}}a{{/if}}|middle|{{#if B}}b{{else}}not-b{{/if}}"
+    
+    assert manager._process_conditional_blocks(content, {'A': False, 'B': False}) == "|middle|not-b"
+    assert manager._process_conditional_blocks(content, {'A': True, 'B': True}) == "a|middle|b"
+
+
+def test_compiled_template_reuse():
+    """Test that a README template is compiled once and reused across renders"""
+    print("\n🧪 Testing Compiled Template Reuse")
+    print("=" * 35)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        template_path = os.path.join(temp_dir, "README.md.template")
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write("# {{PROJECT_NAME}} - {{USERNAME}} {{UNKNOWN}}\n")
+        
+        manager = ReadmeManager(templates_dir=temp_dir)
+        
+        first = manager._process_readme_template(template_path, {'PROJECT_NAME': 'alpha', 'USERNAME': 'Ann'})
+        second = manager._process_readme_template(template_path, {'PROJECT_NAME': 'beta', 'USERNAME': 'Bob'})
+        
+        assert first == "# alpha - Ann {{UNKNOWN}}\n"
+        assert second == "# beta - Bob {{UNKNOWN}}\n"
+        assert len(manager._compiled_templates) == 1
+    
+    print("✅ Compiled template reused across renders")
+
+
+def test_non_identifier_custom_variables():
+    """Test that placeholders which are not Python identifiers are still substituted"""
+    print("\n🧪 Testing Non-Identifier Custom Variables")
+    print("=" * 35)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        templates_dir = os.path.join(temp_dir, "templates")
+        os.makedirs(os.path.join(templates_dir, "rag"))
+        with open(os.path.join(templates_dir, "rag", "README.md.template"), 'w', encoding='utf-8') as f:
+            f.write("A {{MY-VAR}} B {{my var}} C {{USERNAME}} D {{ USERNAME }} E {{0}} F {{MISSING-VAR}}\n")
+        
+        manager = ReadmeManager(templates_dir=templates_dir)
+        config = create_readme_config(
+            username="Ann",
+            project_name="ann-rag",
+            template_type="rag",
+            port_assignment=PortAssignment(login_id="Ann", segment1_start=5000, segment1_end=5050),
+            output_dir=os.path.join(temp_dir, "out"),
+            custom_variables={'MY-VAR': 'X', 'my var': 'Y', '0': 'Z'}
+        )
+        os.makedirs(config.output_dir)
+        
+        with open(manager.create_readme_file(config), 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        assert content == "A X B Y C Ann D {{ USERNAME }} E Z F {{MISSING-VAR}}\n"
+    
+    print("✅ Hyphenated and numeric custom variables substituted")
+
+
+def test_deleted_template_recreated():
+    """Test that a README template deleted after first use is recreated"""
+    print("\n🧪 Testing Deleted Template Recreation")
+    print("=" * 35)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = ReadmeManager(templates_dir=os.path.join(temp_dir, "templates"))
+        config = create_readme_config(
+            username="Ann",
+            project_name="ann-rag",
+            template_type="rag",
+            port_assignment=PortAssignment(login_id="Ann", segment1_start=5000, segment1_end=5050),
+            output_dir=os.path.join(temp_dir, "out")
+        )
+        os.makedirs(config.output_dir)
+        
+        manager.create_readme_file(config)
+        os.remove(manager._get_readme_template_path("rag"))
+        
+        with open(manager.create_readme_file(config), 'r', encoding='utf-8') as f:
+            assert "ann-rag Project - Ann" in f.read()
+    
+    print("✅ Deleted template recreated")
+
+
+def test_bulk_readme_generation():
+    """Test generating READMEs for several students at once"""
+    print("\n🧪 Testing Bulk README Generation")
+    print("=" * 35)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = ReadmeManager(templates_dir=os.path.join(temp_dir, "templates"))
+        configs = []
+        
+        for index, username in enumerate(["Ann", "Bob", "Cid"]):
+            output_dir = os.path.join(temp_dir, username)
+            os.makedirs(output_dir)
+            assignment = PortAssignment(
+                login_id=username,
+                segment1_start=5000 + index * 100,
+                segment1_end=5050 + index * 100
+            )
+            configs.append(create_readme_config(
+                username=username,
+                project_name=f"{username.lower()}-rag",
+                template_type="rag",
+                port_assignment=assignment,
+                output_dir=output_dir
+            ))
+        
+        readme_paths = manager.create_readme_files_bulk(configs)
+        
+        assert readme_paths == [os.path.join(config.output_dir, "README.md") for config in configs]
+        for config, readme_path in zip(configs, readme_paths):
+            with open(readme_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            assert config.project_name in content
+            assert config.username in content
+            assert os.listdir(config.output_dir) == ["README.md"]
+    
+    print("✅ Bulk README generation works")
+
+
 if __name__ == '__main__':
     # Change to project root directory (parent of cli-tool)
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -5,6 +5,7 @@ Tests setup script generation with intelligent database detection,
 health checking, startup coordination, and error recovery guidance.
 """
 
+import dataclasses
 import unittest
 import tempfile
 import os
@@ -65,6 +66,24 @@ class TestSetupScriptManager(unittest.TestCase):
         self.assertEqual(config.services, ["backend", "frontend"])
         self.assertTrue(config.has_common_project)
     
+    def test_setup_script_config_is_immutable(self):
+        """Test that setup script configurations cannot be modified after creation"""
+        config = create_setup_script_config(
+            username="testuser",
+            project_name="test-project",
+            template_type="rag",
+            port_assignment=self.port_assignment,
+            output_dir=self.output_dir,
+            services=["backend"]
+        )
+        
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            config.username = "otheruser"
+        
+        updated = dataclasses.replace(config, username="otheruser")
+        self.assertEqual(updated.username, "otheruser")
+        self.assertEqual(config.username, "testuser")
+    
     def test_intelligent_setup_script_generation_rag_shared(self):
         """Test intelligent setup script generation for RAG with shared infrastructure"""
         config = SetupScriptConfig(
@@ -244,6 +263,35 @@ echo "Frontend port: {{FRONTEND_PORT}}"
         self.assertIn("testuser", content)
         self.assertIn("test-project", content)
     
+    def test_create_setup_scripts_batch(self):
+        """Test creating setup scripts for several students at once"""
+        configs = []
+        for index, username in enumerate(["ann", "bob", "cid"]):
+            output_dir = os.path.join(self.output_dir, username)
+            os.makedirs(output_dir)
+            configs.append(create_setup_script_config(
+                username=username,
+                project_name=f"{username}-rag",
+                template_type="rag",
+                port_assignment=PortAssignment(
+                    login_id=username,
+                    segment1_start=5000 + index * 100,
+                    segment1_end=5009 + index * 100
+                ),
+                output_dir=output_dir,
+                services=["backend", "frontend"]
+            ))
+        
+        script_paths = self.manager.create_setup_scripts_batch(configs)
+        
+        self.assertEqual(script_paths, [os.path.join(config.output_dir, "setup.sh") for config in configs])
+        for config, script_path in zip(configs, script_paths):
+            with open(script_path, 'r') as f:
+                content = f.read()
+            self.assertIn(f"User: {config.username}", content)
+            self.assertIn(config.project_name, content)
+        self.assertEqual(self.manager.create_setup_scripts_batch([]), [])
+    
     def test_convenience_function(self):
         """Test convenience function for setup script generation"""
         script_path = generate_setup_script(
@@ -417,6 +465,69 @@ echo "Frontend port: {{FRONTEND_PORT}}"
         # Check custom variables are included
         self.assertEqual(variables['CUSTOM_API_KEY'], 'test-key')
         self.assertEqual(variables['CUSTOM_ENDPOINT'], 'https://api.example.com')
+    
+    def test_template_variables_single_pass(self):
+        """Test that placeholders are substituted once and unknown ones are kept"""
+        content = self.manager._process_template_variables(
+            "{{USERNAME}} {{PROJECT_NAME}} {{MISSING}}",
+            {'USERNAME': '{{PROJECT_NAME}}', 'PROJECT_NAME': 'test-project'}
+        )
+        
+        self.assertEqual(content, "{{PROJECT_NAME}} test-project {{MISSING}}")
+    
+    def test_script_skeleton_shared_between_students(self):
+        """Test that students with the same project shape get their own values"""
+        other_assignment = PortAssignment(
+            login_id="otheruser",
+            segment1_start=9000,
+            segment1_end=9009
+        )
+        
+        scripts = []
+        for username, assignment in (("testuser", self.port_assignment), ("otheruser", other_assignment)):
+            config = create_setup_script_config(
+                username=username,
+                project_name=f"{username}-rag",
+                template_type="rag",
+                port_assignment=assignment,
+                output_dir=self.output_dir,
+                services=["postgres", "backend", "frontend"]
+            )
+            variables = self.manager._generate_setup_variables(config)
+            scripts.append(self.manager._create_intelligent_setup_script(config, variables))
+        
+        self.assertIn("testuser_user", scripts[0])
+        self.assertIn("testuser_rag", scripts[0])
+        self.assertIn("http://localhost:8007/health", scripts[0])
+        self.assertNotIn("otheruser", scripts[0])
+        self.assertIn("otheruser_user", scripts[1])
+        self.assertIn("http://localhost:9007/health", scripts[1])
+        self.assertNotIn("testuser", scripts[1])
+    
+    def test_template_added_or_removed_later(self):
+        """Test that templates added or removed after a lookup are noticed"""
+        config = create_setup_script_config(
+            username="testuser",
+            project_name="test-project",
+            template_type="late",
+            port_assignment=self.port_assignment,
+            output_dir=self.output_dir,
+            services=["backend"]
+        )
+        variables = self.manager._generate_setup_variables(config)
+        self.assertIn("Intelligent Setup Script", self.manager._generate_intelligent_setup_script(config, variables))
+        
+        template_path = os.path.join(self.templates_dir, "late", "setup.sh.template")
+        os.makedirs(os.path.dirname(template_path), exist_ok=True)
+        with open(template_path, 'w') as f:
+            f.write("#!/bin/bash\necho 'Late template for {{USERNAME}}'")
+        
+        content = self.manager._generate_intelligent_setup_script(config, variables)
+        self.assertIn("Late template for testuser", content)
+        
+        os.remove(template_path)
+        content = self.manager._generate_intelligent_setup_script(config, variables)
+        self.assertIn("Intelligent Setup Script", content)
 
 
 class TestSetupScriptIntegration(unittest.TestCase):
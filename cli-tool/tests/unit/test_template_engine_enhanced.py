@@ -200,6 +200,58 @@ def test_variable_generation_flexibility():
     return True
 
 
+def test_template_file_cache_invalidation():
+    """Test that edited template files are re-read by process_template_file"""
+    print("\n🧪 Testing Template File Cache Invalidation")
+    print("=" * 45)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processor = TemplateProcessor(temp_dir)
+        template_path = os.path.join(temp_dir, "init.sql.template")
+        
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write("CREATE USER {{USERNAME}}_user;")
+        
+        first = processor.process_template_file(template_path, {'USERNAME': 'Emma'})
+        second = processor.process_template_file(template_path, {'USERNAME': 'Bob'})
+        assert first == "CREATE USER Emma_user;"
+        assert second == "CREATE USER Bob_user;"
+        
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write("{{#if_common_project}}GRANT {{USERNAME}};{{/if_common_project}}")
+        stat = os.stat(template_path)
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        edited = processor.process_template_file(template_path, {'USERNAME': 'Emma', 'if_common_project': True})
+        assert edited == "GRANT Emma;"
+    
+    print("✅ Edited template picked up after mtime change")
+    return True
+
+
+def test_static_template_detection():
+    """Test detection of templates that render to their own bytes"""
+    print("\n🧪 Testing Static Template Detection")
+    print("=" * 38)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        processor = TemplateProcessor(temp_dir)
+        cases = {
+            "static.js.template": (b"db.createCollection('logs');\n", True),
+            "variable.js.template": (b"db.createUser('{{USERNAME}}');\n", False),
+            "crlf.js.template": (b"db.createCollection('logs');\r\n", False),
+        }
+        
+        for name, (data, expected) in cases.items():
+            template_path = os.path.join(temp_dir, name)
+            with open(template_path, 'wb') as f:
+                f.write(data)
+            assert processor.is_static_template(template_path) is expected, name
+    
+    print("✅ Static templates detected correctly")
+    return True
+
+
 if __name__ == '__main__':
     # Change to cli-tool directory
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -210,6 +262,8 @@ if __name__ == '__main__':
     success &= test_template_validation()
     success &= test_cli_template_commands()
     success &= test_variable_generation_flexibility()
+    success &= test_template_file_cache_invalidation()
+    success &= test_static_template_detection()
     
     if success:
         print("\n🎉 All enhanced template processing tests passed!")
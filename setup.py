@@ -40,6 +40,7 @@ dev_requirements = [
     "flake8>=3.8.0",
     "mypy>=0.800",
     "coverage>=5.0.0",
+    "build>=0.10.0",
 ]
 
 setup(